@@ -0,0 +1,210 @@
+import json
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from app.utils.text_utils import content_tokens, estimate_tokens, tokenize
+
+# ----------------------------
+# Prompt context assembly
+# ----------------------------
+# Retrieved chunks are split into units (prose sentences and table rows),
+# scored against the question, and packed greedily into a token budget.
+# Near-duplicate units (word-shingle overlap with what's already selected) are
+# dropped: chunks repeat each table as both CSV and JSON (DOCX adds a
+# pipe-joined copy of every row), and retrieved chunks often restate the same
+# sentences. Tables are rendered once, compactly, as
+# "[TABLE n] header; row" with only the rows that match the question.
+# Text without sentence breaks (OCR output, log lines, flattened CSV) is cut
+# into word windows so it can be scored and packed like sentences.
+
+# A unit is a near-duplicate when this share of its word shingles already
+# appear in the context
+DUPLICATE_OVERLAP = 0.8
+SHINGLE_SIZE = 3
+SNIPPET_CHARS = 300
+# Stop packing once less than this much budget is left
+MIN_UNIT_TOKENS = 4
+# Longer sentences are split into word windows of about this many tokens
+MAX_UNIT_TOKENS = 60
+
+_TABLE_MARKER_RE = re.compile(r"\[TABLE (\d+) (CSV|JSON)\]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(\[])")
+_JSON = json.JSONDecoder()
+
+def _shingles(tokens: List[str]) -> FrozenSet[Any]:
+    if len(tokens) < SHINGLE_SIZE:
+        return frozenset(tokens)
+    return frozenset(zip(*(tokens[i:] for i in range(SHINGLE_SIZE))))
+
+def _near_duplicate(shingles: FrozenSet[Any], seen: Set[Any]) -> bool:
+    if not shingles:
+        return True
+    return len(shingles & seen) / len(shingles) >= DUPLICATE_OVERLAP
+
+def _split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END_RE.split(text) if s.strip()]
+
+def _word_windows(text: str, max_tokens: int) -> List[str]:
+    windows: List[str] = []
+    words: List[str] = []
+    used = 0
+    for word in text.split():
+        cost = estimate_tokens(word)
+        if words and used + cost > max_tokens:
+            windows.append(" ".join(words))
+            words, used = [], 0
+        words.append(word)
+        used += cost
+    if words:
+        windows.append(" ".join(words))
+    return windows
+
+def _split_chunk(text: str) -> List[Dict[str, Any]]:
+    """Break chunk text into sentence and table-row units, in reading order.
+
+    Tables keep their JSON form when it parses (row boundaries survive); the
+    CSV form lost its line breaks in chunking, so it's only used when the JSON
+    copy is missing or was cut off at a chunk boundary.
+    """
+    prose: List[Tuple[int, str]] = []
+    tables: Dict[str, List[List[str]]] = {}
+    table_order: Dict[str, int] = {}
+    csv_fallback: Dict[str, Tuple[int, str]] = {}
+
+    pieces = _TABLE_MARKER_RE.split(text)
+    prose.append((0, pieces[0]))
+    for i in range(1, len(pieces), 3):
+        table_id, kind, body = pieces[i], pieces[i + 1], pieces[i + 2]
+        table_order.setdefault(table_id, i)
+        if kind == "CSV":
+            csv_fallback.setdefault(table_id, (i, body))
+            continue
+        body = body.lstrip()
+        try:
+            rows, end = _JSON.raw_decode(body)
+        except ValueError:
+            continue
+        if isinstance(rows, list) and all(isinstance(r, list) for r in rows):
+            tables[table_id] = [[str(cell).strip() for cell in row] for row in rows]
+        prose.append((i + 1, body[end:]))
+
+    for table_id, (order, body) in csv_fallback.items():
+        if table_id not in tables:
+            prose.append((order, body))
+
+    # DOCX also emits each table row as "a | b | c" prose; drop text made up
+    # entirely of cells of a table we have rows for
+    cell_tokens = {t for rows in tables.values() for row in rows for cell in row for t in tokenize(cell)}
+
+    units: List[Dict[str, Any]] = []
+    for order, body in sorted(prose, key=lambda item: item[0]):
+        for sentence in _split_sentences(body):
+            for piece in _word_windows(sentence, MAX_UNIT_TOKENS):
+                tokens = tokenize(piece)
+                if cell_tokens and set(tokens) <= cell_tokens:
+                    continue
+                units.append({"order": order, "text": piece, "tokens": tokens, "table": None})
+    for table_id, rows in tables.items():
+        rows = [row for row in rows if any(row)]
+        if not rows:
+            continue
+        header = ", ".join(rows[0])
+        header_tokens = tokenize(header)
+        for r_index, row in enumerate(rows[1:] or rows, start=1):
+            text = ", ".join(row)
+            units.append({
+                "order": table_order[table_id] + r_index / (len(rows) + 1),
+                "text": text,
+                "tokens": tokenize(text),
+                "header_tokens": header_tokens,
+                "table": (table_id, header),
+            })
+    units.sort(key=lambda u: u["order"])
+    return units
+
+def build_context(
+    question: str,
+    chunks: List[Dict[str, Any]],
+    token_budget: int,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """Pack the most relevant, non-duplicate parts of ranked `chunks` into `token_budget`.
+
+    `chunks` are FAISS metadata entries in retrieval order. Returns the prompt
+    context and one evidence entry per chunk that contributed to it.
+    """
+    query_terms = set(content_tokens(question))
+    candidates: List[Dict[str, Any]] = []
+    for rank, meta in enumerate(chunks):
+        for position, unit in enumerate(_split_chunk(meta.get("text") or "")):
+            terms = set(unit["tokens"]).union(unit.get("header_tokens", ()))
+            unit.update(rank=rank, position=position, score=len(query_terms & terms))
+            candidates.append(unit)
+
+    if not candidates:
+        return "", []
+    matched = [u for u in candidates if u["score"] > 0]
+    if not matched:
+        # Nothing overlaps the question (e.g. a paraphrase only the embedding
+        # caught); fall back to the top chunk in reading order
+        matched = [u for u in candidates if u["rank"] == 0]
+    # Higher overlap first; ties go to the better-ranked chunk, then reading order
+    matched.sort(key=lambda u: (-u["score"], u["rank"], u["position"]))
+
+    selected: List[Dict[str, Any]] = []
+    seen: Set[Any] = set()
+    headers_used = set()
+    used = 0
+    for unit in matched:
+        if token_budget - used < MIN_UNIT_TOKENS:
+            break
+        cost = estimate_tokens(unit["text"])
+        header_key = None
+        if unit["table"] is not None:
+            header_key = (unit["rank"], unit["table"][0])
+            if header_key not in headers_used:
+                cost += estimate_tokens(unit["table"][1]) + 3
+        if used + cost > token_budget:
+            if unit["table"] is not None:
+                continue
+            # Prose is trimmed to what's left rather than dropped
+            text = _word_windows(unit["text"], token_budget - used)[0]
+            cost = estimate_tokens(text)
+            if used + cost > token_budget:
+                continue
+            unit = {**unit, "text": text, "tokens": tokenize(text)}
+        shingles = _shingles(unit["tokens"])
+        if _near_duplicate(shingles, seen):
+            continue
+        used += cost
+        seen |= shingles
+        if header_key is not None:
+            headers_used.add(header_key)
+        selected.append(unit)
+
+    by_chunk: Dict[int, List[Dict[str, Any]]] = {}
+    for unit in selected:
+        by_chunk.setdefault(unit["rank"], []).append(unit)
+
+    lines: List[str] = []
+    evidence: List[Dict[str, Any]] = []
+    for rank in sorted(by_chunk):
+        parts: List[str] = []
+        current_table: Optional[str] = None
+        for unit in sorted(by_chunk[rank], key=lambda u: u["position"]):
+            if unit["table"] is None:
+                current_table = None
+                parts.append(unit["text"])
+                continue
+            table_id, header = unit["table"]
+            if table_id != current_table:
+                current_table = table_id
+                parts.append(f"[TABLE {table_id}] {header};" if unit["text"] != header else f"[TABLE {table_id}]")
+            parts.append(unit["text"] + ";")
+        text = " ".join(parts)
+        lines.append(text)
+        meta = chunks[rank]
+        evidence.append({
+            "documentName": meta.get("doc_id"),
+            "pageNumber": meta.get("page"),
+            "snippet": text[:SNIPPET_CHARS],
+        })
+    return "\n".join(lines), evidence
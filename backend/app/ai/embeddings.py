@@ -1,6 +1,66 @@
+import platform
 from sentence_transformers import SentenceTransformer
+from app.config.settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_ONNX_FILE,
+    EMBEDDING_THREADS,
+)
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# ----------------------------
+# Inference backends
+# ----------------------------
+# "torch" is stock SentenceTransformer. "onnx" runs the same weights through
+# ONNX Runtime and "onnx-int8" a dynamically int8-quantized export; both need
+# `pip install "sentence-transformers[onnx]"` and reuse the ONNX files
+# published with the model (exported on first use if missing). Batches are
+# sorted by length and padded only to the longest text in each batch.
+
+def _onnx_quantized_file() -> str:
+    if EMBEDDING_ONNX_FILE:
+        return EMBEDDING_ONNX_FILE
+    if platform.machine().lower() in {"arm64", "aarch64"}:
+        return "onnx/model_qint8_arm64.onnx"
+    # AVX2 is the widest-supported x86 variant
+    return "onnx/model_quint8_avx2.onnx"
+
+def _onnx_model_kwargs(file_name: str | None) -> dict:
+    try:
+        import onnxruntime as ort
+    except Exception as exc:
+        raise RuntimeError(
+            'onnxruntime is required for EMBEDDING_BACKEND=onnx; install "sentence-transformers[onnx]"'
+        ) from exc
+
+    session_options = ort.SessionOptions()
+    if EMBEDDING_THREADS > 0:
+        session_options.intra_op_num_threads = EMBEDDING_THREADS
+        session_options.inter_op_num_threads = 1
+    kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+    if file_name:
+        kwargs["file_name"] = file_name
+    return kwargs
+
+def load_model(backend: str = EMBEDDING_BACKEND) -> SentenceTransformer:
+    if backend == "torch":
+        if EMBEDDING_THREADS > 0:
+            import torch
+            torch.set_num_threads(EMBEDDING_THREADS)
+        return SentenceTransformer(MODEL_NAME)
+    if backend == "onnx":
+        return SentenceTransformer(MODEL_NAME, backend="onnx", model_kwargs=_onnx_model_kwargs(None))
+    if backend == "onnx-int8":
+        return SentenceTransformer(
+            MODEL_NAME, backend="onnx", model_kwargs=_onnx_model_kwargs(_onnx_quantized_file())
+        )
+    raise RuntimeError(f"Unknown EMBEDDING_BACKEND: {backend}")
+
+model = load_model()
 
 def embed(text):
     return model.encode(text)
+
+def embed_batch(texts):
+    return model.encode(list(texts), batch_size=EMBEDDING_BATCH_SIZE)
@@ -1,4 +1,5 @@
 import requests, os, logging
+from app.utils import metrics
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -7,19 +8,26 @@ def ask_groq(prompt):
     if not api_key:
         raise RuntimeError("GROQ_API_KEY not set")
 
-    response = requests.post(
-        "https://api.groq.com/openai/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}"
-        },
-        json={
-            "model": "openai/gpt-oss-120b",
-            "messages": [{"role": "user", "content": prompt}]
-        },
-        timeout=30
-    )
+    with metrics.timer("groq_request"):
+        response = requests.post(
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}"
+            },
+            json={
+                "model": "openai/gpt-oss-120b",
+                "messages": [{"role": "user", "content": prompt}]
+            },
+            timeout=30
+        )
     if response.status_code != 200:
+        metrics.inc("groq_errors")
         logger.error("Groq error %s: %s", response.status_code, response.text)
         raise RuntimeError(f"Groq API error: {response.status_code}")
     data = response.json()
+    usage = data.get("usage") or {}
+    if usage.get("prompt_tokens"):
+        metrics.inc("groq_prompt_tokens", usage["prompt_tokens"])
+    if usage.get("completion_tokens"):
+        metrics.inc("groq_completion_tokens", usage["completion_tokens"])
     return data["choices"][0]["message"]["content"]
@@ -1,23 +1,52 @@
 from typing import Any, Dict, List, Tuple
 import logging
+import re
 import numpy as np
+from app.ai.context import build_context
 from app.ai.embeddings import embed
-from app.vector_store.faiss_index import search, metadata_store, embedding_store
+from app.vector_store import faiss_index, lexical_index
 from app.ai.groq_client import ask_groq
+from app.config.settings import CONTEXT_TOKEN_BUDGET, RETRIEVAL_MODE
+from app.utils import metrics
+from app.utils.text_utils import estimate_tokens
 
 logger = logging.getLogger("uvicorn.error")
 
+TOP_K = 5
+# Each retriever contributes this many candidates to hybrid fusion
+FUSION_CANDIDATES = 20
+RRF_K = 60
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid", "auto")
+if RETRIEVAL_MODE not in RETRIEVAL_MODES:
+    raise RuntimeError(f"Unknown RETRIEVAL_MODE: {RETRIEVAL_MODE}")
+# Figures and identifiers: anything with a digit ("12.5%", "2023", "INV-0042")
+# or word characters joined by . - _ / ("BRK.B", "cost-of-sales")
+_IDENTIFIER_RE = re.compile(r"\d|\w[._\-/]\w")
+
 def _build_context_and_evidence(
+    question: str,
     indices: List[int],
     document_id: str | None = None
 ) -> Tuple[str, List[Dict[str, Any]]]:
-    evidence: List[Dict[str, Any]] = []
+    metadata_store = faiss_index.metadata_store
+    chunks: List[Dict[str, Any]] = []
     for i in indices:
         if i < 0 or i >= len(metadata_store):
             continue
         meta = metadata_store[i]
         if document_id and meta.get("doc_id") != document_id:
             continue
+        chunks.append(meta)
+
+    if CONTEXT_TOKEN_BUDGET > 0:
+        context, evidence = build_context(question, chunks, CONTEXT_TOKEN_BUDGET)
+        if context:
+            return context, evidence
+
+    # Budget disabled (or nothing fit it): raw snippet prefixes of every
+    # retrieved chunk
+    evidence: List[Dict[str, Any]] = []
+    for meta in chunks:
         snippet = (meta.get("text") or "").strip()
         if snippet:
             snippet = snippet[:300]
@@ -30,40 +59,99 @@ def _build_context_and_evidence(
     context = "\n".join([e["snippet"] for e in evidence if e.get("snippet")])
     return context, evidence
 
-def rag_answer(question: str, document_id: str | None = None) -> Dict[str, Any]:
-    if not metadata_store:
+def _dense_indices(q_emb, document_id: str | None = None, k: int = TOP_K) -> List[int]:
+    metadata_store = faiss_index.metadata_store
+    embedding_store = faiss_index.embedding_store
+    if not document_id:
+        _, indices = faiss_index.search(q_emb, k=k)
+        return [i for i in indices[0].tolist() if i >= 0]
+
+    doc_indices = [i for i, meta in enumerate(metadata_store) if meta.get("doc_id") == document_id]
+    if not doc_indices:
+        return []
+
+    emb_matrix = np.array([embedding_store[i] for i in doc_indices if i < len(embedding_store)])
+    if emb_matrix.size == 0:
+        # Fallback if embeddings aren't stored; use first few chunks of the doc
+        return doc_indices[:k]
+
+    q_vec = np.array(q_emb)
+    dists = np.sum((emb_matrix - q_vec) ** 2, axis=1)
+    top_k = min(k, len(doc_indices))
+    top_local = np.argsort(dists)[:top_k]
+    return [doc_indices[i] for i in top_local.tolist()]
+
+def _lexical_indices(question: str, document_id: str | None = None, k: int = TOP_K) -> List[int]:
+    return [i for i, _ in lexical_index.search(question, k=k, doc_id=document_id)]
+
+def _fuse(rankings: List[List[int]], k: int = TOP_K) -> List[int]:
+    # Reciprocal rank fusion: scores are comparable across retrievers
+    # without normalizing L2 distances against BM25 scores
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, i in enumerate(ranking):
+            scores[i] = scores.get(i, 0.0) + 1.0 / (RRF_K + rank + 1)
+    return sorted(scores, key=lambda i: scores[i], reverse=True)[:k]
+
+def _is_keyword_query(question: str) -> bool:
+    # Only exact-match lookups skip the embedding search: quoted phrases, or
+    # queries made up entirely of figures/identifiers. Short questions in
+    # words ("Who is the CEO?") still need dense retrieval.
+    if question.count('"') >= 2:
+        return True
+    tokens = [t.strip("?!,;:()[]'") for t in question.split()]
+    tokens = [t for t in tokens if t]
+    return bool(tokens) and all(_IDENTIFIER_RE.search(t) for t in tokens)
+
+def _retrieve_indices(question: str, document_id: str | None = None, mode: str | None = None) -> List[int]:
+    mode = (mode or RETRIEVAL_MODE).lower()
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {mode}")
+    if mode == "auto":
+        mode = "lexical" if _is_keyword_query(question) else "hybrid"
+
+    lexical: List[int] = []
+    if mode in {"lexical", "hybrid"}:
+        with metrics.timer("qa_search_lexical"):
+            lexical = _lexical_indices(
+                question, document_id, TOP_K if mode == "lexical" else FUSION_CANDIDATES
+            )
+        if mode == "lexical":
+            if lexical:
+                return lexical
+            # Nothing matched verbatim; let the embedding search try
+            mode = "dense"
+
+    with metrics.timer("qa_embed"):
+        q_emb = embed(question)
+    with metrics.timer("qa_search_dense"):
+        dense = _dense_indices(q_emb, document_id, TOP_K if mode == "dense" else FUSION_CANDIDATES)
+    if mode == "dense":
+        return dense
+    return _fuse([dense, lexical])
+
+def rag_answer(question: str, document_id: str | None = None, mode: str | None = None) -> Dict[str, Any]:
+    metrics.inc("qa_requests")
+    with metrics.timer("qa_total"):
+        return _rag_answer(question, document_id, mode)
+
+def _rag_answer(question: str, document_id: str | None = None, mode: str | None = None) -> Dict[str, Any]:
+    if not faiss_index.metadata_store:
         return {
             "answer": "No processed documents found yet. Please upload a PDF and wait for processing to complete.",
             "confidence": "low",
             "evidence": [],
         }
 
-    q_emb = embed(question)
-
-    if document_id:
-        doc_indices = [i for i, meta in enumerate(metadata_store) if meta.get("doc_id") == document_id]
-        if doc_indices:
-            emb_matrix = np.array([embedding_store[i] for i in doc_indices if i < len(embedding_store)])
-            if emb_matrix.size == 0:
-                # Fallback if embeddings aren't stored; use first few chunks of the doc
-                indices_list = doc_indices[:5]
-            else:
-                q_vec = np.array(q_emb)
-                dists = np.sum((emb_matrix - q_vec) ** 2, axis=1)
-                top_k = min(5, len(doc_indices))
-                top_local = np.argsort(dists)[:top_k]
-                indices_list = [doc_indices[i] for i in top_local.tolist()]
-        else:
-            indices_list = []
-    else:
-        _, indices = search(q_emb, k=5)
-        indices_list = indices[0].tolist()
-
-    context, evidence = _build_context_and_evidence(indices_list, document_id)
+    with metrics.timer("qa_search"):
+        indices_list = _retrieve_indices(question, document_id, mode)
+
+    with metrics.timer("qa_context"):
+        context, evidence = _build_context_and_evidence(question, indices_list, document_id)
 
     if document_id and not context:
         logger.warning("No context for document_id %s. Falling back to global context.", document_id)
-        context, evidence = _build_context_and_evidence(indices_list, None)
+        context, evidence = _build_context_and_evidence(question, indices_list, None)
 
     if not context:
         return {
@@ -79,9 +167,11 @@ def rag_answer(question: str, document_id: str | None = None) -> Dict[str, Any]:
 
     Question: {question}
     """
+    metrics.inc("qa_context_tokens", estimate_tokens(context))
 
     try:
-        answer = ask_groq(prompt)
+        with metrics.timer("qa_generate"):
+            answer = ask_groq(prompt)
     except Exception as e:
         logger.exception("RAG generation failed")
         answer = "I couldn't generate an answer right now. Please try again."
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 from app.vector_store.faiss_index import index, metadata_store
+from app.utils import metrics
 
 router = APIRouter(prefix="/debug", tags=["Debug"])
 
@@ -9,3 +11,10 @@ def vector_count():
         "faiss_vectors": int(index.ntotal),
         "metadata_entries": len(metadata_store),
     }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
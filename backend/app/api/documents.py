@@ -1,15 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends, Request, Response, Query
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
 import os
-import shutil
 import uuid
 from datetime import datetime
 from app.processing.pipeline import process_document
 from app.auth.verify_token import verify_firebase_token
+from app.services import uploads
+from app.services.uploads import UPLOAD_DIR, UploadTooLarge, UploadSessionError
 from app.vector_store.faiss_index import remove_document
-from app.config.firebase import db
-from google.cloud.firestore_v1 import FieldFilter
-from google.api_core.exceptions import NotFound
+from app.services.storage import get_store, StoreUnavailable
 import logging
 
 # ----------------------------
@@ -22,13 +23,14 @@ router = APIRouter(
 
 logger = logging.getLogger("uvicorn.error")
 
-# ----------------------------
-# Local storage configuration
-# ----------------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
+ALLOWED_EXTENSIONS = {".pdf", ".txt", ".md", ".docx", ".doc"}
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Fields returned by GET /documents/list (and the default projection)
+LIST_FIELDS = [
+    "filename", "original_filename", "status", "created_at", "updated_at",
+    "size_bytes", "page_count", "chunk_count", "company_names", "doc_year", "owner_id",
+]
+MAX_PAGE_SIZE = 500
 
 # ----------------------------
 # Background processing
@@ -37,28 +39,28 @@ def _process_document_task(filename: str, file_path: str) -> None:
     logger.info("Background processing started for %s", filename)
     try:
         file_ext = os.path.splitext(filename)[1].lower()
-        if file_ext in {".pdf", ".docx", ".doc"}:
+        if file_ext in {".pdf", ".docx", ".doc", ".txt", ".md"}:
             process_document(filename, file_path)
-            db.collection("documents").document(filename).set({
+            get_store().set_document(filename, {
                 "status": "completed",
                 "processed": True,
                 "updated_at": datetime.utcnow().isoformat(),
-            }, merge=True)
+            })
         else:
-            db.collection("documents").document(filename).set({
+            get_store().set_document(filename, {
                 "status": "completed",
                 "processed": False,
                 "note": "Processing skipped for unsupported file type",
                 "updated_at": datetime.utcnow().isoformat(),
-            }, merge=True)
+            })
     except Exception as e:
         logger.exception("Background processing failed for %s", filename)
-        db.collection("documents").document(filename).set({
+        get_store().set_document(filename, {
             "status": "failed",
             "processed": False,
             "error": str(e),
             "updated_at": datetime.utcnow().isoformat(),
-        }, merge=True)
+        })
 
 # ----------------------------
 # Health Check
@@ -71,40 +73,31 @@ def documents_health():
     }
 
 # ----------------------------
-# Upload Document
+# Upload helpers
 # ----------------------------
-@router.post("/upload")
-async def upload_document(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    user_id: str = Depends(verify_firebase_token),
-):
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No file provided")
-
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    allowed_extensions = {".pdf", ".txt", ".md", ".docx", ".doc"}
-
-    if file_ext not in allowed_extensions:
+def _validate_extension(filename: str) -> str:
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail="Only PDF, TXT, and MD files are supported"
         )
+    return file_ext
 
-    unique_name = f"{uuid.uuid4().hex}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, unique_name)
-
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        logger.exception("Failed to save upload to disk")
-        raise HTTPException(status_code=500, detail=f"Local save failed: {e}")
-
+def _register_upload(
+    background_tasks: BackgroundTasks,
+    unique_name: str,
+    original_filename: str,
+    file_path: str,
+    size_bytes: int,
+    sha256: str,
+    user_id: str,
+) -> Dict[str, Any]:
     metadata = {
         "filename": unique_name,
-        "original_filename": file.filename,
-        "size_bytes": os.path.getsize(file_path),
+        "original_filename": original_filename,
+        "size_bytes": size_bytes,
+        "sha256": sha256,
         "created_at": datetime.utcnow().isoformat(),
         "updated_at": datetime.utcnow().isoformat(),
         "processed": False,
@@ -113,47 +106,171 @@ async def upload_document(
         "owner_id": user_id,
     }
     try:
-        db.collection("documents").document(unique_name).set(metadata, merge=True)
-    except NotFound:
-        logger.exception("Firestore database not initialized")
+        get_store().set_document(unique_name, metadata)
+    except StoreUnavailable:
+        logger.exception("Metadata database not initialized")
         raise HTTPException(status_code=500, detail="Firestore database not initialized.")
     except Exception as e:
-        logger.exception("Failed to write Firestore metadata")
+        logger.exception("Failed to write document metadata")
         raise HTTPException(status_code=500, detail=f"Firestore write failed: {e}")
 
     background_tasks.add_task(_process_document_task, unique_name, file_path)
 
     return {
         "message": "File uploaded successfully",
-        "original_filename": file.filename,
-        "stored_filename": unique_name
+        "original_filename": original_filename,
+        "stored_filename": unique_name,
+        "sha256": sha256,
     }
 
+# ----------------------------
+# Upload Document
+# ----------------------------
+@router.post("/upload")
+async def upload_document(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    user_id: str = Depends(verify_firebase_token),
+):
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+
+    file_ext = _validate_extension(file.filename)
+
+    # By now Starlette has already spooled the multipart body to a temp file
+    # (BodySizeLimitMiddleware caps how much it will accept); this copies it
+    # into uploads/ while hashing. Use the resumable endpoints to stream large
+    # files straight to disk without the extra copy.
+    unique_name = f"{uuid.uuid4().hex}{file_ext}"
+    file_path = os.path.join(UPLOAD_DIR, unique_name)
+
+    try:
+        size_bytes, sha256 = await uploads.save_upload_file(file, file_path)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="File too large")
+    except Exception as e:
+        logger.exception("Failed to save upload to disk")
+        raise HTTPException(status_code=500, detail=f"Local save failed: {e}")
+
+    return await run_in_threadpool(
+        _register_upload,
+        background_tasks, unique_name, file.filename, file_path, size_bytes, sha256, user_id,
+    )
+
+# ----------------------------
+# Resumable Uploads
+# ----------------------------
+# For large files: create a session, PUT raw byte ranges at increasing
+# offsets (the body is streamed straight to disk, never spooled), query the
+# session to resume after a failure, then complete it to start processing.
+class UploadSessionRequest(BaseModel):
+    filename: str
+    size_bytes: int
+
+def _owned_session(upload_id: str, user_id: str) -> Dict[str, Any]:
+    try:
+        session = uploads.get_session(upload_id)
+    except UploadSessionError:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if session.get("owner_id") != user_id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+@router.post("/uploads")
+def create_upload_session(
+    payload: UploadSessionRequest,
+    user_id: str = Depends(verify_firebase_token),
+):
+    _validate_extension(payload.filename)
+    if payload.size_bytes <= 0:
+        raise HTTPException(status_code=400, detail="size_bytes must be positive")
+    try:
+        return uploads.create_session(payload.filename, payload.size_bytes, user_id)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="File too large")
+
+@router.get("/uploads/{upload_id}")
+def get_upload_session(upload_id: str, user_id: str = Depends(verify_firebase_token)):
+    return _owned_session(upload_id, user_id)
+
+@router.put("/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = 0,
+    user_id: str = Depends(verify_firebase_token),
+):
+    await run_in_threadpool(_owned_session, upload_id, user_id)
+    try:
+        received = await uploads.append_chunk(upload_id, offset, request.stream())
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadSessionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"upload_id": upload_id, "received_bytes": received}
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload_session(
+    upload_id: str,
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(verify_firebase_token),
+):
+    session = await run_in_threadpool(_owned_session, upload_id, user_id)
+    file_ext = _validate_extension(session["original_filename"])
+    unique_name = f"{upload_id}{file_ext}"
+    file_path = os.path.join(UPLOAD_DIR, unique_name)
+
+    try:
+        session, sha256 = await uploads.complete_session(upload_id, file_path)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return await run_in_threadpool(
+        _register_upload,
+        background_tasks, unique_name, session["original_filename"], file_path,
+        session["size_bytes"], sha256, user_id,
+    )
+
+@router.delete("/uploads/{upload_id}")
+async def abort_upload_session(upload_id: str, user_id: str = Depends(verify_firebase_token)):
+    await run_in_threadpool(_owned_session, upload_id, user_id)
+    try:
+        await uploads.abort_session(upload_id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": f"Upload {upload_id} aborted"}
+
 # ----------------------------
 # List Uploaded Documents
 # ----------------------------
 @router.get("/list", response_model=List[Dict[str, Any]])
-def list_documents():
+def list_documents(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return"),
+):
+    selected = LIST_FIELDS
+    if fields:
+        selected = [f for f in fields.split(",") if f in LIST_FIELDS] or ["filename"]
+
     results: List[Dict[str, Any]] = []
     try:
-        docs = db.collection("documents").stream()
-        for doc in docs:
-            data = doc.to_dict() or {}
-            results.append({
-                "filename": data.get("filename", doc.id),
-                "original_filename": data.get("original_filename"),
-                "status": data.get("status", "uploaded"),
-                "created_at": data.get("created_at"),
-                "updated_at": data.get("updated_at"),
-                "size_bytes": data.get("size_bytes"),
-                "page_count": data.get("page_count"),
-                "chunk_count": data.get("chunk_count"),
-                "company_names": data.get("company_names"),
-                "doc_year": data.get("doc_year"),
-                "owner_id": data.get("owner_id"),
-            })
-    except NotFound:
+        page, next_cursor = get_store().list_documents_page(limit, cursor, selected)
+    except StoreUnavailable:
         return []
+
+    for doc_id, data in page:
+        item = {field: data.get(field) for field in selected}
+        if "filename" in item:
+            item["filename"] = data.get("filename", doc_id)
+        if "status" in item:
+            item["status"] = data.get("status", "uploaded")
+        results.append(item)
+
+    # The body stays a plain list for existing clients; paging uses a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return results
 
 # ----------------------------
@@ -167,10 +284,10 @@ def delete_document(filename: str):
         os.remove(file_path)
 
     try:
-        db.collection("documents").document(filename).delete()
-        for doc in db.collection("chunks").where(filter=FieldFilter("doc_id", "==", filename)).stream():
-            doc.reference.delete()
-    except NotFound:
+        store = get_store()
+        store.delete_document(filename)
+        store.delete_chunks(filename)
+    except StoreUnavailable:
         pass
 
     remaining = remove_document(filename)
@@ -1,7 +1,6 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict
-from app.config.firebase import db
-from google.api_core.exceptions import NotFound
+from fastapi import APIRouter, HTTPException, Response, Query
+from typing import Dict, Optional
+from app.services.storage import get_store, StoreUnavailable
 
 # ----------------------------
 # Router setup
@@ -27,14 +26,14 @@ def metadata_health():
 @router.post("/create/{filename}")
 def create_metadata(filename: str):
     try:
-        doc = db.collection("documents").document(filename).get()
-        if not doc.exists:
+        data = get_store().get_document(filename)
+        if data is None:
             raise HTTPException(status_code=404, detail="Document not found")
         return {
             "message": "Metadata already exists",
-            "metadata": doc.to_dict(),
+            "metadata": data,
         }
-    except NotFound:
+    except StoreUnavailable:
         raise HTTPException(status_code=500, detail="Firestore database not initialized.")
 
 # ----------------------------
@@ -43,11 +42,11 @@ def create_metadata(filename: str):
 @router.get("/{filename}", response_model=Dict)
 def get_metadata(filename: str):
     try:
-        doc = db.collection("documents").document(filename).get()
-        if not doc.exists:
+        data = get_store().get_document(filename)
+        if data is None:
             raise HTTPException(status_code=404, detail="Metadata not found")
-        return doc.to_dict()
-    except NotFound:
+        return data
+    except StoreUnavailable:
         raise HTTPException(status_code=500, detail="Firestore database not initialized.")
 
 # ----------------------------
@@ -56,24 +55,32 @@ def get_metadata(filename: str):
 @router.put("/processed/{filename}")
 def mark_processed(filename: str):
     try:
-        db.collection("documents").document(filename).set({
+        store = get_store()
+        store.set_document(filename, {
             "processed": True,
-        }, merge=True)
-        doc = db.collection("documents").document(filename).get()
+        })
         return {
             "message": "Metadata updated",
-            "metadata": doc.to_dict() if doc.exists else {},
+            "metadata": store.get_document(filename) or {},
         }
-    except NotFound:
+    except StoreUnavailable:
         raise HTTPException(status_code=500, detail="Firestore database not initialized.")
 
 # ----------------------------
 # List All Metadata
 # ----------------------------
 @router.get("/list/all")
-def list_all_metadata():
+def list_all_metadata(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return"),
+):
+    selected = [f for f in fields.split(",") if f] if fields else None
     try:
-        docs = db.collection("documents").stream()
-        return [doc.to_dict() for doc in docs]
-    except NotFound:
+        page, next_cursor = get_store().list_documents_page(limit, cursor, selected)
+    except StoreUnavailable:
         return []
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [data for _, data in page]
@@ -1,3 +1,4 @@
+from typing import Literal
 from fastapi import APIRouter
 from pydantic import BaseModel
 from app.ai.rag import rag_answer
@@ -7,8 +8,10 @@ router = APIRouter()
 class QARequest(BaseModel):
     question: str
     documentId: str | None = None
+    # Defaults to RETRIEVAL_MODE
+    mode: Literal["dense", "lexical", "hybrid", "auto"] | None = None
 
 @router.post("/qa")
 def qa(payload: QARequest):
-    result = rag_answer(payload.question, payload.documentId)
+    result = rag_answer(payload.question, payload.documentId, payload.mode)
     return result
@@ -1,24 +1,42 @@
-from fastapi import APIRouter, UploadFile, Depends
+from fastapi import APIRouter, UploadFile, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.auth.verify_token import verify_firebase_token
-from app.config.firebase import db, bucket
+from app.config.settings import MAX_UPLOAD_BYTES
+from app.services.storage import get_store
 import uuid
 
 router = APIRouter()
 
+# Files larger than one chunk go through GCS resumable uploads in 8 MB parts
+# (chunk_size must be a multiple of 256 KB).
+GCS_CHUNK_BYTES = 8 * 1024 * 1024
+
+def _upload_blob(blob, fileobj) -> None:
+    blob.chunk_size = GCS_CHUNK_BYTES
+    blob.upload_from_file(fileobj, rewind=True)
+
 @router.post("/upload")
 async def upload_file(
     file: UploadFile,
     user_id: str = Depends(verify_firebase_token)
 ):
+    # BodySizeLimitMiddleware already capped the request body; this catches
+    # files inside the multipart overhead allowance
+    if MAX_UPLOAD_BYTES and (file.size or 0) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    # Imported here so the SQLite backend runs without Firebase credentials
+    from app.config.firebase import bucket
+
     doc_id = str(uuid.uuid4())
 
     blob = bucket.blob(f"users/{user_id}/{doc_id}/{file.filename}")
-    blob.upload_from_file(file.file)
+    await run_in_threadpool(_upload_blob, blob, file.file)
 
-    db.collection("documents").document(doc_id).set({
+    await run_in_threadpool(get_store().set_document, doc_id, {
         "user_id": user_id,
         "filename": file.filename,
         "status": "uploaded"
-    })
+    }, merge=False)
 
     return {"doc_id": doc_id, "status": "uploaded"}
@@ -1,10 +1,137 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
 from firebase_admin import auth
 from fastapi import Header, HTTPException
+from app.config.settings import TOKEN_CACHE_SIZE, CERT_REFRESH_ENABLED
+from app.utils import metrics
 
+logger = logging.getLogger("uvicorn.error")
+
+# Google's signing certificates for Firebase ID tokens
+ID_TOKEN_CERT_URI = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+
+# Drop cached entries slightly before `exp` so a token is never accepted
+# after Firebase itself would reject it.
+EXPIRY_LEEWAY_SECONDS = 5
+CERT_REFRESH_MARGIN_SECONDS = 300
+CERT_REFRESH_DEFAULT_SECONDS = 3600
+CERT_REFRESH_RETRY_SECONDS = 60
+
+# ----------------------------
+# Verified-token cache
+# ----------------------------
+# Keyed by SHA-256 of the raw token so the bearer credential itself is never
+# held in memory longer than the request; value is (uid, exp).
+_token_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _cache_get(key: str) -> str | None:
+    now = time.time()
+    with _cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        uid, exp = entry
+        if exp - EXPIRY_LEEWAY_SECONDS <= now:
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return uid
+
+def _cache_put(key: str, uid: str, exp: float) -> None:
+    if TOKEN_CACHE_SIZE <= 0:
+        return
+    with _cache_lock:
+        _token_cache[key] = (uid, exp)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+def clear_token_cache() -> None:
+    with _cache_lock:
+        _token_cache.clear()
+
+def token_cache_size() -> int:
+    return len(_token_cache)
+
+# ----------------------------
+# Proactive certificate refresh
+# ----------------------------
+# firebase_admin caches the signing certificates per their Cache-Control
+# max-age and refetches them synchronously inside verify_id_token once they
+# go stale. Re-fetching through the SDK's own cached session shortly before
+# expiry keeps that blocking fetch off the request path.
+_refresher_started = False
+_refresher_lock = threading.Lock()
+
+def _max_age(headers) -> int | None:
+    match = re.search(r"max-age=(\d+)", headers.get("cache-control", "") or "")
+    return int(match.group(1)) if match else None
+
+def _refresh_certificates() -> int:
+    client = auth._get_client(None)
+    request = client._token_verifier.request
+    response = request(ID_TOKEN_CERT_URI, headers={"Cache-Control": "no-cache"})
+    if response.status != 200:
+        raise RuntimeError(f"Certificate fetch failed: {response.status}")
+    metrics.inc("auth_cert_refreshes")
+    max_age = _max_age(response.headers) or CERT_REFRESH_DEFAULT_SECONDS
+    return max(CERT_REFRESH_RETRY_SECONDS, max_age - CERT_REFRESH_MARGIN_SECONDS)
+
+def _cert_refresh_loop() -> None:
+    while True:
+        try:
+            delay = _refresh_certificates()
+        except AttributeError:
+            logger.warning("firebase_admin internals changed; certificate prefetch disabled")
+            return
+        except Exception:
+            logger.exception("Certificate refresh failed")
+            delay = CERT_REFRESH_RETRY_SECONDS
+        time.sleep(delay)
+
+def _ensure_cert_refresher() -> None:
+    global _refresher_started
+    if _refresher_started or not CERT_REFRESH_ENABLED:
+        return
+    with _refresher_lock:
+        if _refresher_started:
+            return
+        _refresher_started = True
+        threading.Thread(
+            target=_cert_refresh_loop,
+            name="firebase-cert-refresh",
+            daemon=True,
+        ).start()
+
+# ----------------------------
+# Dependency
+# ----------------------------
 def verify_firebase_token(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401)
 
     token = authorization.split(" ")[1]
-    decoded = auth.verify_id_token(token)
+    key = _token_key(token)
+    uid = _cache_get(key)
+    if uid is not None:
+        metrics.inc("auth_token_cache_hits")
+        return uid
+
+    metrics.inc("auth_token_cache_misses")
+    _ensure_cert_refresher()
+    with metrics.timer("auth_verify"):
+        decoded = auth.verify_id_token(token)
+    _cache_put(key, decoded["uid"], float(decoded.get("exp", 0)))
     return decoded["uid"]
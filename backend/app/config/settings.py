@@ -3,4 +3,57 @@ import os
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Per-stage latency/throughput instrumentation exposed at /debug/metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in {"1", "true", "yes"}
+
+# Verified Firebase ID-token cache (0 disables) and background refresh of
+# Google's token signing certificates
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+CERT_REFRESH_ENABLED = os.getenv("CERT_REFRESH_ENABLED", "true").lower() in {"1", "true", "yes"}
+
+# Largest accepted upload (0 disables the limit)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "1024")) * 1024 * 1024
+
+# PDF table extraction: "pdfplumber", "pymupdf" (single open, PyMuPDF's own
+# table finder) or "off"; gating skips pages that fail a cheap pre-check
+PDF_TABLE_EXTRACTOR = os.getenv("PDF_TABLE_EXTRACTOR", "pdfplumber").lower()
+PDF_TABLE_GATING = os.getenv("PDF_TABLE_GATING", "true").lower() in {"1", "true", "yes"}
+
+# Where document metadata and chunk text are stored: "firestore" or "sqlite"
+METADATA_BACKEND = os.getenv("METADATA_BACKEND", "firestore").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(BASE_DIR, "metadata", "insighthub.db"))
+
+# In-process document metadata cache. With the listener on, a Firestore
+# on_snapshot mirror keeps it coherent; otherwise entries are write-through
+# and expire after DOC_CACHE_TTL_SECONDS.
+DOC_CACHE_ENABLED = os.getenv("DOC_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+DOC_CACHE_LISTENER = os.getenv("DOC_CACHE_LISTENER", "true").lower() in {"1", "true", "yes"}
+DOC_CACHE_TTL_SECONDS = float(os.getenv("DOC_CACHE_TTL_SECONDS", "5"))
+
+# QA retrieval: "dense" (FAISS), "lexical" (BM25), "hybrid" (both, fused with
+# reciprocal rank fusion) or "auto" (BM25 alone for quoted phrases and
+# queries made only of figures/identifiers, hybrid otherwise)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense").lower()
+
+# Approximate token budget for the QA prompt context. Retrieved chunks are
+# deduplicated and trimmed to their most relevant sentences/table rows to fit;
+# 0 sends the raw 300-char prefix of every retrieved chunk instead. At 160 the
+# benchmark's prompts are smaller than the raw ones and more often contain the
+# answer; larger budgets only add tokens (see `benchmarks.run --context-budget`).
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "160"))
+
+# Embedding inference: "torch" (SentenceTransformer default), "onnx" (ONNX
+# Runtime) or "onnx-int8" (dynamically quantized ONNX). EMBEDDING_THREADS caps
+# intra-op threads (0 = library default); EMBEDDING_ONNX_FILE overrides which
+# quantized export is loaded.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE") or None
+
+# Resumable upload sessions older than this are deleted (0 disables the sweep)
+UPLOAD_SESSION_TTL_SECONDS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24")) * 3600
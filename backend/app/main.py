@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import upload, documents, metadata, charts, qa, debug
+from app.config.settings import MAX_UPLOAD_BYTES
+from app.services.uploads import MULTIPART_OVERHEAD_BYTES
+from app.utils.body_limit import BodySizeLimitMiddleware
 
 app = FastAPI(title="InsightHub Backend")
 
@@ -13,6 +16,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
+)
+
+# Enforced before the body is read; route handlers see already-spooled files
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES if MAX_UPLOAD_BYTES else 0,
+    path_prefixes=["/upload", "/documents/upload"],
 )
 
 app.include_router(upload.router)
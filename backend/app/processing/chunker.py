@@ -1,10 +1,12 @@
-def chunk_text(pages, chunk_size=500):
-    chunks = []
+def iter_chunks(pages, chunk_size=500):
+    # Lazy over `pages`, so streamed inputs are never fully materialized
     for p in pages:
         words = p["text"].split()
         for i in range(0, len(words), chunk_size):
-            chunks.append({
+            yield {
                 "text": " ".join(words[i:i+chunk_size]),
                 "page": p["page"]
-            })
-    return chunks
+            }
+
+def chunk_text(pages, chunk_size=500):
+    return list(iter_chunks(pages, chunk_size))
@@ -4,6 +4,27 @@ import json
 import re
 import fitz  # PyMuPDF
 from PIL import Image
+from app.config.settings import PDF_TABLE_EXTRACTOR, PDF_TABLE_GATING
+from app.utils import metrics
+
+# Table pre-check thresholds: a page is a table candidate if its vector
+# drawings contain a grid (at least TABLE_MIN_RULES distinct horizontal rules
+# crossing TABLE_MIN_RULES distinct vertical rules), or if enough text rows
+# are split into several widely spaced columns. A lone rectangle (page
+# border, callout, highlight) only has two rules each way, so it isn't a grid.
+TABLE_MIN_RULES = 3
+TABLE_RULE_TOLERANCE = 2.0
+TABLE_MIN_ROWS = 3
+TABLE_MIN_COLUMNS = 3
+TABLE_COLUMN_GAP = 15.0
+
+# Plain-text/markdown pseudo-pages: flush at the first paragraph break after
+# TEXT_PAGE_CHARS, at a markdown heading once a quarter of that is buffered,
+# and unconditionally at twice the target so one huge paragraph (or a log with
+# no blank lines) can't grow a page without bound.
+TEXT_PAGE_CHARS = 16000
+TEXT_EXTENSIONS = {".txt", ".md"}
+_MD_HEADING_RE = re.compile(r"^#{1,6}\s")
 
 def _assets_dir(file_path):
     base = os.path.splitext(os.path.basename(file_path))[0]
@@ -23,64 +44,183 @@ def _ocr_image_bytes(image_bytes):
         raise RuntimeError("pytesseract is required for OCR processing") from exc
 
     img = Image.open(io.BytesIO(image_bytes))
-    return pytesseract.image_to_string(img)
+    with metrics.timer("parse_ocr"):
+        return pytesseract.image_to_string(img)
 
 def _extract_chart_numbers(text):
     # Best-effort numeric extraction from OCR text
     return re.findall(r"[-+]?(?:\d+\.?\d*|\d*\.\d+)", text)
 
-def _extract_pdf(pdf_path):
-    import re
+def _rule_segments(page):
+    """Horizontal (y, x0, x1) and vertical (x, y0, y1) rules in the page's drawings."""
+    horizontal, vertical = set(), set()
+
+    def add(x0, y0, x1, y1):
+        if abs(y0 - y1) < TABLE_RULE_TOLERANCE:
+            horizontal.add((round(y0), round(min(x0, x1)), round(max(x0, x1))))
+        elif abs(x0 - x1) < TABLE_RULE_TOLERANCE:
+            vertical.add((round(x0), round(min(y0, y1)), round(max(y0, y1))))
+
+    for path in page.get_drawings():
+        for item in path["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                add(p1.x, p1.y, p2.x, p2.y)
+            elif item[0] == "re":
+                r = item[1]
+                # Hairline rectangles are how many producers draw rules
+                if r.height < TABLE_RULE_TOLERANCE and r.width >= r.height:
+                    mid_y = (r.y0 + r.y1) / 2
+                    add(r.x0, mid_y, r.x1, mid_y)
+                elif r.width < TABLE_RULE_TOLERANCE:
+                    mid_x = (r.x0 + r.x1) / 2
+                    add(mid_x, r.y0, mid_x, r.y1)
+                else:
+                    add(r.x0, r.y0, r.x1, r.y0)
+                    add(r.x0, r.y1, r.x1, r.y1)
+                    add(r.x0, r.y0, r.x0, r.y1)
+                    add(r.x1, r.y0, r.x1, r.y1)
+    return horizontal, vertical
+
+def _has_ruled_grid(horizontal, vertical):
+    if len({y for y, _, _ in horizontal}) < TABLE_MIN_RULES or len({x for x, _, _ in vertical}) < TABLE_MIN_RULES:
+        return False
+    # A grid needs TABLE_MIN_RULES columns that each cross TABLE_MIN_RULES
+    # distinct rows; separate boxes never share rules like that
+    tol = TABLE_RULE_TOLERANCE
+    rows_crossed = {}
+    for y, hx0, hx1 in horizontal:
+        for x, vy0, vy1 in vertical:
+            if hx0 - tol <= x <= hx1 + tol and vy0 - tol <= y <= vy1 + tol:
+                rows_crossed.setdefault(x, set()).add(y)
+    columns = sum(1 for ys in rows_crossed.values() if len(ys) >= TABLE_MIN_RULES)
+    return columns >= TABLE_MIN_RULES
+
+def _page_may_have_table(page, textpage=None):
+    # Ruled tables: rules that actually intersect into a grid
     try:
-        import pdfplumber
-    except Exception as exc:
-        raise RuntimeError("pdfplumber is required for PDF table extraction") from exc
+        if _has_ruled_grid(*_rule_segments(page)):
+            return True
+    except Exception:
+        return True
+
+    # Borderless tables: rows of words separated into several wide-gapped columns
+    rows = {}
+    for x0, y0, x1, _, _, _, _, _ in page.get_text("words", textpage=textpage):
+        rows.setdefault(round(y0), []).append((x0, x1))
+    columnar_rows = 0
+    for spans in rows.values():
+        if len(spans) < TABLE_MIN_COLUMNS:
+            continue
+        spans.sort()
+        columns = 1
+        for (_, prev_x1), (x0, _) in zip(spans, spans[1:]):
+            if x0 - prev_x1 > TABLE_COLUMN_GAP:
+                columns += 1
+        if columns >= TABLE_MIN_COLUMNS:
+            columnar_rows += 1
+            if columnar_rows >= TABLE_MIN_ROWS:
+                return True
+    return False
+
+def _table_text_parts(tables):
+    parts = []
+    for t_index, table in enumerate(tables, start=1):
+        clean_rows = [[(cell or "").strip() for cell in row] for row in table]
+        csv_lines = [", ".join(row) for row in clean_rows if any(row)]
+        table_json = json.dumps(clean_rows, ensure_ascii=True)
+        if csv_lines:
+            parts.append(f"[TABLE {t_index} CSV]\n" + "\n".join(csv_lines))
+        parts.append(f"[TABLE {t_index} JSON]\n{table_json}")
+    return parts
+
+class _PdfTableExtractor:
+    """Runs the configured table finder, opening pdfplumber only if needed."""
+
+    def __init__(self, pdf_path, extractor=None, gating=None):
+        self.pdf_path = pdf_path
+        self.extractor = extractor or PDF_TABLE_EXTRACTOR
+        self.gating = PDF_TABLE_GATING if gating is None else gating
+        self._plumber = None
+        if self.extractor == "pdfplumber":
+            try:
+                import pdfplumber
+            except Exception as exc:
+                raise RuntimeError("pdfplumber is required for PDF table extraction") from exc
+            self._pdfplumber = pdfplumber
+        elif self.extractor not in {"pymupdf", "off"}:
+            # Caught here: extract() failures are swallowed per page, so an
+            # unknown value would silently disable table extraction
+            raise RuntimeError(f"Unknown PDF_TABLE_EXTRACTOR: {self.extractor}")
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._plumber is not None:
+            self._plumber.close()
+        return False
+
+    def _pdfplumber_page(self, index):
+        if self._plumber is None:
+            self._plumber = self._pdfplumber.open(self.pdf_path)
+        return self._plumber.pages[index]
+
+    def extract(self, page, index, textpage=None):
+        if self.extractor == "off":
+            return []
+        if self.gating and not _page_may_have_table(page, textpage):
+            metrics.inc("parse_pdf_table_pages_skipped")
+            return []
+        metrics.inc("parse_pdf_table_pages_scanned")
+        if self.extractor == "pymupdf":
+            return [table.extract() for table in page.find_tables().tables]
+        return self._pdfplumber_page(index).extract_tables() or []
+
+def _extract_pdf(pdf_path, table_extractor=None, table_gating=None):
     assets_dir = _assets_dir(pdf_path)
     pages = []
-    with fitz.open(pdf_path) as doc:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(doc):
-                text_parts = [page.get_text()]
-
-                # Table extraction via pdfplumber (best-effort)
-                try:
-                    pdf_page = pdf.pages[i]
-                    tables = pdf_page.extract_tables() or []
-                    for t_index, table in enumerate(tables, start=1):
-                        clean_rows = [[(cell or "").strip() for cell in row] for row in table]
-                        csv_lines = [", ".join(row) for row in clean_rows if any(row)]
-                        table_json = json.dumps(clean_rows, ensure_ascii=True)
-                        if csv_lines:
-                            text_parts.append(f"[TABLE {t_index} CSV]\n" + "\n".join(csv_lines))
-                        text_parts.append(f"[TABLE {t_index} JSON]\n{table_json}")
-                except Exception:
-                    pass
-
-                # Image extraction + OCR + numeric candidates
-                try:
-                    for img_index, img in enumerate(page.get_images(full=True), start=1):
-                        xref = img[0]
-                        pix = fitz.Pixmap(doc, xref)
-                        if pix.n > 4:
-                            pix = fitz.Pixmap(fitz.csRGB, pix)
-                        img_path = os.path.join(
-                            assets_dir,
-                            f"page_{i+1:03d}_img_{img_index:02d}.png",
-                        )
-                        pix.save(img_path)
-                        with open(img_path, "rb") as f:
-                            image_bytes = f.read()
-                        ocr_text = _ocr_image_bytes(image_bytes).strip()
-                        if ocr_text:
-                            text_parts.append(f"[IMAGE OCR] {ocr_text}")
-                            nums = _extract_chart_numbers(ocr_text)
-                            if nums:
-                                text_parts.append("[CHART DATA CANDIDATES] " + ", ".join(nums))
-                except Exception:
-                    pass
-
-                pages.append({"page": i + 1, "text": "\n".join([p for p in text_parts if p])})
+    with fitz.open(pdf_path) as doc, \
+            _PdfTableExtractor(pdf_path, table_extractor, table_gating) as table_finder:
+        for i, page in enumerate(doc):
+            with metrics.timer("parse_pdf_text"):
+                # Shared with the table pre-check so the page is only laid out once
+                textpage = page.get_textpage()
+                text_parts = [page.get_text(textpage=textpage)]
+
+            # Table extraction, only on pages that pass the cheap pre-check (best-effort)
+            try:
+                with metrics.timer("parse_pdf_tables"):
+                    tables = table_finder.extract(page, i, textpage)
+                text_parts.extend(_table_text_parts(tables))
+            except Exception:
+                pass
+
+            # Image extraction + OCR + numeric candidates
+            try:
+                for img_index, img in enumerate(page.get_images(full=True), start=1):
+                    xref = img[0]
+                    pix = fitz.Pixmap(doc, xref)
+                    if pix.n > 4:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    img_path = os.path.join(
+                        assets_dir,
+                        f"page_{i+1:03d}_img_{img_index:02d}.png",
+                    )
+                    pix.save(img_path)
+                    with open(img_path, "rb") as f:
+                        image_bytes = f.read()
+                    ocr_text = _ocr_image_bytes(image_bytes).strip()
+                    if ocr_text:
+                        text_parts.append(f"[IMAGE OCR] {ocr_text}")
+                        nums = _extract_chart_numbers(ocr_text)
+                        if nums:
+                            text_parts.append("[CHART DATA CANDIDATES] " + ", ".join(nums))
+            except Exception:
+                pass
+
+            pages.append({"page": i + 1, "text": "\n".join([p for p in text_parts if p])})
+    metrics.inc("parse_pdf_pages", len(pages))
     return pages
 
 def _ocr_pdf(pdf_path):
@@ -90,10 +230,12 @@ def _ocr_pdf(pdf_path):
     except Exception as exc:
         raise RuntimeError("pdf2image and pytesseract are required for OCR processing") from exc
 
-    images = convert_from_path(pdf_path, dpi=300)
+    with metrics.timer("parse_pdf_rasterize"):
+        images = convert_from_path(pdf_path, dpi=300)
     pages = []
     for i, img in enumerate(images):
-        text = pytesseract.image_to_string(img)
+        with metrics.timer("parse_ocr"):
+            text = pytesseract.image_to_string(img)
         pages.append({"page": i + 1, "text": text})
     return pages
 
@@ -160,6 +302,52 @@ def _extract_doc(doc_path):
     text = textract.process(doc_path).decode("utf-8", errors="ignore")
     return [{"page": 1, "text": text}]
 
+def _iter_text_pages(text_path, page_chars=TEXT_PAGE_CHARS):
+    # Incremental buffered reads; readline's size cap bounds memory even for
+    # single-line files (minified dumps, logs without newlines)
+    markdown = os.path.splitext(text_path)[1].lower() == ".md"
+    page_number = 0
+    buf = []
+    buf_chars = 0
+
+    def flush():
+        nonlocal page_number, buf, buf_chars
+        text = "".join(buf).strip()
+        buf, buf_chars = [], 0
+        if not text:
+            return None
+        page_number += 1
+        metrics.inc("parse_text_pages")
+        return {"page": page_number, "text": text}
+
+    with open(text_path, "r", encoding="utf-8-sig", errors="replace") as f:
+        while True:
+            line = f.readline(page_chars)
+            if not line:
+                break
+            blank = not line.strip()
+            if markdown and buf_chars >= page_chars // 4 and _MD_HEADING_RE.match(line):
+                page = flush()
+                if page:
+                    yield page
+            buf.append(line)
+            buf_chars += len(line)
+            if (blank and buf_chars >= page_chars) or buf_chars >= 2 * page_chars:
+                page = flush()
+                if page:
+                    yield page
+    page = flush()
+    if page:
+        yield page
+
+def iter_pages(file_path):
+    """Yield {"page", "text"} dicts; plain text and markdown are streamed."""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in TEXT_EXTENSIONS:
+        yield from _iter_text_pages(file_path)
+    else:
+        yield from extract_text(file_path)
+
 def extract_text(file_path):
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
@@ -172,4 +360,6 @@ def extract_text(file_path):
         return _extract_docx(file_path)
     if ext == ".doc":
         return _extract_doc(file_path)
+    if ext in TEXT_EXTENSIONS:
+        return list(_iter_text_pages(file_path))
     return []
@@ -1,27 +1,106 @@
 import logging
 import re
+import time
 from collections import Counter
-from app.processing.parser import extract_text
-from app.processing.chunker import chunk_text
-from app.ai.embeddings import embed
+from app.processing.parser import iter_pages
+from app.processing.chunker import iter_chunks
+from app.ai.embeddings import embed_batch
 from app.vector_store.faiss_index import add_embedding, save_index
-from app.config.firebase import db
-from google.cloud.firestore_v1 import FieldFilter
-from google.api_core.exceptions import NotFound
+from app.vector_store import lexical_index
+from app.services.storage import get_store, StoreUnavailable
+from app.utils import metrics
 
 logger = logging.getLogger("uvicorn.error")
 
+# Chunks are embedded, indexed and written in windows of this size, so a
+# streamed TXT/MD file never has more than one window of chunks in memory
+INGEST_WINDOW = 256
+
+def _timed(iterable, name, timings):
+    # Accumulates time spent producing items from a lazy stage
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        item = next(iterator, None)
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+        if item is None:
+            return
+        yield item
+
+def _index_window(doc_id, window, store, timings):
+    with metrics.timer("ingest_embed", timings):
+        embeddings = embed_batch([c["text"] for c in window])
+
+    chunk_records = []
+    for c, emb in zip(window, embeddings):
+        with metrics.timer("ingest_faiss_add", timings):
+            faiss_index = add_embedding(emb, {
+                "doc_id": doc_id,
+                "text": c["text"],
+                "page": c["page"],
+            })
+        with metrics.timer("ingest_lexical_add", timings):
+            lexical_index.add(faiss_index, doc_id, c["text"])
+        chunk_records.append({
+            "text": c["text"],
+            "page": c["page"],
+            "faiss_index": int(faiss_index),
+        })
+
+    try:
+        # One batched write per window instead of a round trip per chunk
+        with metrics.timer("ingest_store_write", timings):
+            store.add_chunks(doc_id, chunk_records)
+    except StoreUnavailable:
+        pass
+
 def process_document(doc_id, pdf_path):
     logger.info("Processing document %s at %s", doc_id, pdf_path)
-    pages = extract_text(pdf_path)
-    chunks = chunk_text(pages)
-    logger.info("Extracted %s pages and %s chunks", len(pages), len(chunks))
+    timings = {}
+    started = time.perf_counter()
+
+    store = get_store()
+    try:
+        # Remove any existing chunks for this document to avoid duplicates
+        with metrics.timer("ingest_store_write", timings):
+            store.delete_chunks(doc_id)
+    except StoreUnavailable:
+        pass
+
+    page_count = 0
+    head_pages = []
+
+    def pages():
+        nonlocal page_count
+        for page in _timed(iter_pages(pdf_path), "ingest_extract", timings):
+            page_count += 1
+            if len(head_pages) < 2:
+                head_pages.append(page.get("text", ""))
+            yield page
+
+    chunk_count = 0
+    window = []
+    for chunk in _timed(iter_chunks(pages()), "ingest_chunk", timings):
+        window.append(chunk)
+        if len(window) == INGEST_WINDOW:
+            _index_window(doc_id, window, store, timings)
+            chunk_count += len(window)
+            window = []
+    if window:
+        _index_window(doc_id, window, store, timings)
+        chunk_count += len(window)
+
+    # Chunking pulls pages through extraction, so its time includes extract's
+    timings["ingest_chunk"] = max(timings.get("ingest_chunk", 0.0) - timings.get("ingest_extract", 0.0), 0.0)
+    metrics.observe("ingest_extract", timings.get("ingest_extract", 0.0))
+    metrics.observe("ingest_chunk", timings["ingest_chunk"])
+    logger.info("Extracted %s pages and %s chunks", page_count, chunk_count)
 
-    if not chunks:
-        raise RuntimeError("No text extracted from PDF")
+    if not chunk_count:
+        raise RuntimeError("No text extracted from document")
 
     # Basic metadata extraction
-    full_text = "\n".join([p.get("text", "") for p in pages[:2]]).strip()
+    full_text = "\n".join(head_pages).strip()
     year_candidates = re.findall(r"\b(19|20)\d{2}\b", full_text)
     doc_year = None
     if year_candidates:
@@ -37,41 +116,29 @@ def process_document(doc_id, pdf_path):
     company_counts = Counter(company_candidates)
     company_names = [name for name, _ in company_counts.most_common(5)]
 
-    try:
-        # Remove any existing chunks for this document to avoid duplicates
-        for doc in db.collection("chunks").where(filter=FieldFilter("doc_id", "==", doc_id)).stream():
-            doc.reference.delete()
-    except NotFound:
-        pass
+    with metrics.timer("ingest_save_index", timings):
+        save_index()
 
-    for c in chunks:
-        emb = embed(c["text"])
-        faiss_index = add_embedding(emb, {
-            "doc_id": doc_id,
-            "text": c["text"],
-            "page": c["page"],
-        })
+    total = time.perf_counter() - started
+    metrics.observe("ingest_document", total)
+    metrics.inc("ingest_documents")
+    metrics.inc("ingest_pages", page_count)
+    metrics.inc("ingest_chunks", chunk_count)
 
-        try:
-            db.collection("chunks").add({
-                "doc_id": doc_id,
-                "text": c["text"],
-                "page": c["page"],
-                "faiss_index": int(faiss_index),
-            })
-        except NotFound:
-            # Firestore not initialized for this project
-            pass
+    ingest_timings = {name: round(seconds, 4) for name, seconds in timings.items()}
+    ingest_timings["total"] = round(total, 4)
+    if total > 0:
+        ingest_timings["pages_per_sec"] = round(page_count / total, 3)
+        ingest_timings["chunks_per_sec"] = round(chunk_count / total, 3)
 
     try:
-        db.collection("documents").document(doc_id).set({
+        store.set_document(doc_id, {
             "status": "completed",
-            "page_count": len(pages),
-            "chunk_count": len(chunks),
+            "page_count": page_count,
+            "chunk_count": chunk_count,
             "doc_year": doc_year,
             "company_names": company_names,
-        }, merge=True)
-    except NotFound:
+            "ingest_timings": ingest_timings,
+        })
+    except StoreUnavailable:
         pass
-
-    save_index()
@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.services.storage import MetadataStore, paginate
+from app.utils import metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+# ----------------------------
+# Read-through document metadata cache
+# ----------------------------
+# Wraps a MetadataStore so status polling (`GET /metadata/{filename}`) and the
+# list endpoints stop generating database reads.
+#
+# Coherence:
+# - If the backend can stream changes (Firestore `on_snapshot`), the cache is a
+#   full mirror of the `documents` collection. Once the first snapshot lands,
+#   gets and lists are served from memory and entries never expire, but only
+#   while the listener reports itself active: Watch streams can stop on
+#   unrecoverable errors without telling us, so a dead listener drops the
+#   mirror and the cache falls back to the TTL/read-through mode below.
+# - Otherwise our own writes go through the cache (write-through) and entries
+#   expire after `ttl_seconds`, bounding staleness from other workers.
+
+class CachedStore(MetadataStore):
+    def __init__(self, inner: MetadataStore, ttl_seconds: float = 5.0, listen: bool = True):
+        self.inner = inner
+        self.ttl_seconds = ttl_seconds
+        self._docs: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+        self._mirrored = False
+        self._listening = False
+        self._watch = None
+        if listen and hasattr(inner, "watch_documents"):
+            # Set first: the initial snapshot can arrive before on_snapshot returns
+            self._listening = True
+            try:
+                self._watch = inner.watch_documents(self._apply_changes)
+            except Exception:
+                self._listening = False
+                logger.exception("Document snapshot listener failed to start; using TTL cache")
+
+    def _apply_changes(self, changes: List[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not self._listening:
+                return
+            for doc_id, data in changes:
+                if data is None:
+                    self._docs.pop(doc_id, None)
+                else:
+                    self._docs[doc_id] = (data, now)
+            self._mirrored = True
+
+    def _mirror_live(self) -> bool:
+        # Caller holds self._lock
+        if not self._mirrored:
+            return False
+        if self._watch is None or getattr(self._watch, "is_active", False):
+            # No handle yet means on_snapshot hasn't returned; it's running
+            return True
+        logger.warning("Document snapshot listener stopped; falling back to TTL cache")
+        self._listening = False
+        self._mirrored = False
+        self._docs.clear()
+        return False
+
+    def _fresh(self, cached_at: float, mirrored: bool) -> bool:
+        return mirrored or time.monotonic() - cached_at < self.ttl_seconds
+
+    def _remember(self, doc_id: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._docs[doc_id] = (data, time.monotonic())
+
+    def close(self) -> None:
+        with self._lock:
+            self._listening = False
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        with self._lock:
+            self._mirrored = False
+            self._docs.clear()
+
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            mirrored = self._mirror_live()
+            entry = self._docs.get(doc_id)
+        if entry is not None and self._fresh(entry[1], mirrored):
+            metrics.inc("doc_cache_hits")
+            return dict(entry[0])
+        if entry is None and mirrored:
+            # The mirror is authoritative: a miss means it doesn't exist
+            metrics.inc("doc_cache_hits")
+            return None
+
+        metrics.inc("doc_cache_misses")
+        data = self.inner.get_document(doc_id)
+        if data is not None:
+            self._remember(doc_id, data)
+        return dict(data) if data is not None else None
+
+    def set_document(self, doc_id: str, data: Dict[str, Any], merge: bool = True) -> None:
+        self.inner.set_document(doc_id, data, merge=merge)
+        with self._lock:
+            entry = self._docs.get(doc_id)
+            if not merge:
+                self._docs[doc_id] = (dict(data), time.monotonic())
+            elif entry is not None:
+                self._docs[doc_id] = ({**entry[0], **data}, time.monotonic())
+            elif self._mirror_live():
+                # New document: the listener will deliver the server's copy too
+                self._docs[doc_id] = (dict(data), time.monotonic())
+
+    def delete_document(self, doc_id: str) -> None:
+        self.inner.delete_document(doc_id)
+        with self._lock:
+            self._docs.pop(doc_id, None)
+
+    def _mirror_snapshot(self) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        with self._lock:
+            if not self._mirror_live():
+                return None
+            docs = [(doc_id, data) for doc_id, (data, _) in self._docs.items()]
+        return sorted(docs, key=lambda item: item[0])
+
+    def list_documents(self) -> List[Tuple[str, Dict[str, Any]]]:
+        docs = self._mirror_snapshot()
+        if docs is not None:
+            metrics.inc("doc_cache_hits")
+            return [(doc_id, dict(data)) for doc_id, data in docs]
+
+        metrics.inc("doc_cache_misses")
+        docs = self.inner.list_documents()
+        for doc_id, data in docs:
+            self._remember(doc_id, data)
+        return docs
+
+    def list_documents_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+        docs = self._mirror_snapshot()
+        if docs is not None:
+            metrics.inc("doc_cache_hits")
+            page, next_cursor = paginate(docs, limit, cursor, fields)
+            return [(doc_id, dict(data)) for doc_id, data in page], next_cursor
+
+        metrics.inc("doc_cache_misses")
+        page, next_cursor = self.inner.list_documents_page(limit, cursor, fields)
+        if fields is None:
+            for doc_id, data in page:
+                self._remember(doc_id, data)
+        return page, next_cursor
+
+    # Chunk text isn't cached; it's only read in bulk by /charts
+    def add_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        self.inner.add_chunks(doc_id, chunks)
+
+    def delete_chunks(self, doc_id: str) -> None:
+        self.inner.delete_chunks(doc_id)
+
+    def chunk_texts(self, limit: Optional[int] = None) -> List[str]:
+        return self.inner.chunk_texts(limit)
@@ -0,0 +1,108 @@
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1 import FieldFilter
+from app.services.storage import MetadataStore, StoreUnavailable
+
+# Firestore caps a batched write at 500 operations
+BATCH_LIMIT = 500
+
+def _wrap_not_found(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except NotFound as exc:
+            # Firestore not initialized for this project
+            raise StoreUnavailable(str(exc)) from exc
+    return wrapper
+
+class FirestoreStore(MetadataStore):
+    def __init__(self, db=None):
+        if db is None:
+            from app.config.firebase import db
+        self.db = db
+
+    @_wrap_not_found
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = self.db.collection("documents").document(doc_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    @_wrap_not_found
+    def set_document(self, doc_id: str, data: Dict[str, Any], merge: bool = True) -> None:
+        self.db.collection("documents").document(doc_id).set(data, merge=merge)
+
+    @_wrap_not_found
+    def delete_document(self, doc_id: str) -> None:
+        self.db.collection("documents").document(doc_id).delete()
+
+    @_wrap_not_found
+    def list_documents(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return [(doc.id, doc.to_dict() or {}) for doc in self.db.collection("documents").stream()]
+
+    @_wrap_not_found
+    def list_documents_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+        query = self.db.collection("documents").order_by("__name__")
+        if fields is not None:
+            # Projection: only the requested fields come back over the wire
+            query = query.select(list(fields))
+        if cursor is not None:
+            query = query.start_after({"__name__": cursor})
+        if limit is not None:
+            # One extra row tells us whether there's a next page
+            query = query.limit(limit + 1)
+        docs = [(doc.id, doc.to_dict() or {}) for doc in query.stream()]
+        next_cursor = None
+        if limit is not None and len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = docs[-1][0]
+        return docs, next_cursor
+
+    def watch_documents(self, callback: Callable[[List[Tuple[str, Optional[Dict[str, Any]]]]], None]):
+        """Stream document changes as (doc_id, data or None if removed) batches."""
+        def on_snapshot(_docs, changes, _read_time):
+            callback([
+                (
+                    change.document.id,
+                    None if change.type.name == "REMOVED" else (change.document.to_dict() or {}),
+                )
+                for change in changes
+            ])
+
+        return self.db.collection("documents").on_snapshot(on_snapshot)
+
+    @_wrap_not_found
+    def add_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        collection = self.db.collection("chunks")
+        for start in range(0, len(chunks), BATCH_LIMIT):
+            batch = self.db.batch()
+            for chunk in chunks[start:start + BATCH_LIMIT]:
+                batch.set(collection.document(), {**chunk, "doc_id": doc_id})
+            batch.commit()
+
+    @_wrap_not_found
+    def delete_chunks(self, doc_id: str) -> None:
+        query = self.db.collection("chunks").where(filter=FieldFilter("doc_id", "==", doc_id))
+        batch = self.db.batch()
+        pending = 0
+        for doc in query.stream():
+            batch.delete(doc.reference)
+            pending += 1
+            if pending == BATCH_LIMIT:
+                batch.commit()
+                batch = self.db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+
+    @_wrap_not_found
+    def chunk_texts(self, limit: Optional[int] = None) -> List[str]:
+        query = self.db.collection("chunks")
+        if limit:
+            query = query.limit(limit)
+        return [(doc.to_dict() or {}).get("text", "") for doc in query.stream()]
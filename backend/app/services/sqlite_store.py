@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.services.storage import MetadataStore, project
+
+# ----------------------------
+# SQLite metadata backend
+# ----------------------------
+# Single-node drop-in for Firestore. Document records are stored as JSON with
+# the fields we filter/sort on (owner_id, status, created_at) broken out into
+# indexed columns. WAL mode lets other processes (e.g. extra uvicorn workers)
+# read while this one writes.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    owner_id TEXT,
+    status TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_owner_id ON documents(owner_id);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status);
+CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents(created_at);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT NOT NULL,
+    page INTEGER,
+    faiss_index INTEGER,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id);
+"""
+
+class SQLiteStore(MetadataStore):
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        # One connection per process, serialized by a lock; FastAPI runs sync
+        # handlers and background tasks on a threadpool.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write_document(self, doc_id: str, data: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO documents (doc_id, owner_id, status, created_at, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                doc_id,
+                data.get("owner_id"),
+                data.get("status"),
+                data.get("created_at"),
+                json.dumps(data, ensure_ascii=True),
+            ),
+        )
+
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_document(self, doc_id: str, data: Dict[str, Any], merge: bool = True) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if merge:
+                    row = self._conn.execute(
+                        "SELECT data FROM documents WHERE doc_id = ?", (doc_id,)
+                    ).fetchone()
+                    if row:
+                        data = {**json.loads(row[0]), **data}
+                self._write_document(doc_id, data)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete_document(self, doc_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+
+    def list_documents(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT doc_id, data FROM documents ORDER BY doc_id").fetchall()
+        return [(doc_id, json.loads(data)) for doc_id, data in rows]
+
+    def list_documents_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+        sql = "SELECT doc_id, data FROM documents"
+        params: List[Any] = []
+        if cursor is not None:
+            sql += " WHERE doc_id > ?"
+            params.append(cursor)
+        sql += " ORDER BY doc_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0]
+        return [(doc_id, project(json.loads(data), fields)) for doc_id, data in rows], next_cursor
+
+    def add_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO chunks (doc_id, page, faiss_index, text) VALUES (?, ?, ?, ?)",
+                    [
+                        (doc_id, c.get("page"), c.get("faiss_index"), c.get("text"))
+                        for c in chunks
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete_chunks(self, doc_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+
+    def chunk_texts(self, limit: Optional[int] = None) -> List[str]:
+        sql = "SELECT text FROM chunks ORDER BY id"
+        params: Tuple[Any, ...] = ()
+        if limit:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [row[0] or "" for row in rows]
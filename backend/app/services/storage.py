@@ -0,0 +1,109 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config.settings import (
+    METADATA_BACKEND,
+    SQLITE_PATH,
+    DOC_CACHE_ENABLED,
+    DOC_CACHE_LISTENER,
+    DOC_CACHE_TTL_SECONDS,
+)
+
+# ----------------------------
+# Metadata store interface
+# ----------------------------
+# Document records and chunk text live behind this interface so the API and
+# pipeline don't care whether they're backed by Firestore or a local SQLite
+# file. Select the backend with METADATA_BACKEND=firestore|sqlite.
+
+class StoreUnavailable(Exception):
+    """The backing database isn't reachable/initialized (e.g. no Firestore DB)."""
+
+class MetadataStore(ABC):
+    @abstractmethod
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def set_document(self, doc_id: str, data: Dict[str, Any], merge: bool = True) -> None:
+        ...
+
+    @abstractmethod
+    def delete_document(self, doc_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def list_documents(self) -> List[Tuple[str, Dict[str, Any]]]:
+        ...
+
+    def list_documents_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+        """Documents ordered by id, starting after `cursor`; returns (page, next_cursor)."""
+        docs = sorted(self.list_documents(), key=lambda item: item[0])
+        return paginate(docs, limit, cursor, fields)
+
+    @abstractmethod
+    def add_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        ...
+
+    @abstractmethod
+    def delete_chunks(self, doc_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def chunk_texts(self, limit: Optional[int] = None) -> List[str]:
+        ...
+
+def project(data: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return data
+    return {f: data[f] for f in fields if f in data}
+
+def paginate(
+    docs: List[Tuple[str, Dict[str, Any]]],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[Iterable[str]],
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+    """Page over `docs`, which must already be sorted by id."""
+    if cursor is not None:
+        docs = [item for item in docs if item[0] > cursor]
+    next_cursor = None
+    if limit is not None and len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = docs[-1][0]
+    return [(doc_id, project(data, fields)) for doc_id, data in docs], next_cursor
+
+_store: Optional[MetadataStore] = None
+_store_lock = threading.Lock()
+
+def _create_store(backend: str) -> MetadataStore:
+    if backend == "sqlite":
+        from app.services.sqlite_store import SQLiteStore
+        store = SQLiteStore(SQLITE_PATH)
+    elif backend == "firestore":
+        from app.services.firestore import FirestoreStore
+        store = FirestoreStore()
+    else:
+        raise RuntimeError(f"Unknown METADATA_BACKEND: {backend}")
+
+    if DOC_CACHE_ENABLED:
+        from app.services.doc_cache import CachedStore
+        store = CachedStore(store, ttl_seconds=DOC_CACHE_TTL_SECONDS, listen=DOC_CACHE_LISTENER)
+    return store
+
+def get_store() -> MetadataStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store(METADATA_BACKEND)
+    return _store
+
+def set_store(store: MetadataStore) -> None:
+    global _store
+    _store = store
@@ -0,0 +1,326 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Tuple
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.config.settings import MAX_UPLOAD_BYTES, UPLOAD_SESSION_TTL_SECONDS
+
+logger = logging.getLogger("uvicorn.error")
+
+# ----------------------------
+# Local storage configuration
+# ----------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
+PARTIAL_DIR = os.path.join(UPLOAD_DIR, ".partial")
+
+# Read/write granularity for streamed uploads. Each chunk is written and
+# hashed in the threadpool so the event loop never blocks on disk or SHA-256.
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Headroom for multipart boundaries/headers on top of MAX_UPLOAD_BYTES
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+os.makedirs(PARTIAL_DIR, exist_ok=True)
+
+class UploadTooLarge(Exception):
+    pass
+
+class UploadSessionError(Exception):
+    pass
+
+class UploadSessionBusy(UploadSessionError):
+    pass
+
+def _write_and_hash(f, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    f.write(chunk)
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# ----------------------------
+# Single-request streaming upload
+# ----------------------------
+async def save_upload_file(
+    upload: UploadFile,
+    dest_path: str,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+) -> Tuple[int, str]:
+    """Stream `upload` to `dest_path` off the event loop; returns (size, sha256)."""
+    hasher = hashlib.sha256()
+    size = 0
+    f = await run_in_threadpool(open, dest_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+            await run_in_threadpool(_write_and_hash, f, hasher, chunk)
+    except BaseException:
+        await run_in_threadpool(f.close)
+        await run_in_threadpool(_remove_quietly, dest_path)
+        raise
+    await run_in_threadpool(f.close)
+    return size, hasher.hexdigest()
+
+# ----------------------------
+# Resumable uploads
+# ----------------------------
+# A session is a partial file plus a JSON sidecar under uploads/.partial/.
+# The received offset is always the partial file's size on disk, so a client
+# can resume after a dropped connection (or against another worker) by asking
+# for the offset and continuing from there.
+#
+# Appends, completion and abort hold an OS file lock on `<id>.lock`, shared by
+# every worker, so a retried PUT racing the original can't append the same
+# bytes twice; the loser gets UploadSessionBusy. Sessions older than
+# UPLOAD_SESSION_TTL_SECONDS are swept when new sessions are created.
+
+# Minimum time between expiry sweeps in one process
+SWEEP_INTERVAL_SECONDS = 600
+_last_sweep = 0.0
+
+# Running hashers keyed by upload_id, valid only while they match the partial
+# file's size; otherwise the hash is recomputed when the session completes.
+_hashers: Dict[str, Tuple[Any, int]] = {}
+
+def _session_paths(upload_id: str) -> Tuple[str, str]:
+    if not upload_id.isalnum():
+        raise UploadSessionError("Invalid upload id")
+    return (
+        os.path.join(PARTIAL_DIR, f"{upload_id}.part"),
+        os.path.join(PARTIAL_DIR, f"{upload_id}.json"),
+    )
+
+def _lock_session(upload_id: str):
+    """Take the session's cross-process lock without waiting; returns the lock handle."""
+    _, meta_path = _session_paths(upload_id)
+    # Don't leave lock files behind for unknown or finished sessions
+    if not os.path.exists(meta_path):
+        raise UploadSessionError("Upload session not found")
+    lock_path = os.path.join(PARTIAL_DIR, f"{upload_id}.lock")
+    f = open(lock_path, "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        raise UploadSessionBusy("Another request is writing to this upload")
+    if not os.path.exists(meta_path):
+        # Completed or aborted between the check and the lock
+        _unlock_session(f)
+        _remove_quietly(lock_path)
+        raise UploadSessionError("Upload session not found")
+    return f
+
+def _unlock_session(f) -> None:
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    f.close()
+
+def _remove_session_files(upload_id: str) -> None:
+    part_path, meta_path = _session_paths(upload_id)
+    _hashers.pop(upload_id, None)
+    _remove_quietly(part_path)
+    _remove_quietly(meta_path)
+    # Removed while still locked: anyone waiting on the old file finds the
+    # session gone once they get the lock. Windows refuses to delete an open
+    # file; the sweep picks those up later.
+    try:
+        os.remove(os.path.join(PARTIAL_DIR, f"{upload_id}.lock"))
+    except OSError:
+        pass
+
+def sweep_expired_sessions(ttl_seconds: float = UPLOAD_SESSION_TTL_SECONDS) -> int:
+    """Delete sessions (and orphaned partial files) older than `ttl_seconds`."""
+    cutoff = datetime.utcnow() - timedelta(seconds=ttl_seconds)
+    removed = 0
+    live = set()
+    for meta_path in glob.glob(os.path.join(PARTIAL_DIR, "*.json")):
+        upload_id = os.path.splitext(os.path.basename(meta_path))[0]
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                created_at = datetime.fromisoformat(json.load(f)["created_at"])
+        except (OSError, ValueError, KeyError):
+            # Unreadable sidecar: treat it as expired
+            created_at = cutoff
+        if created_at > cutoff:
+            live.add(upload_id)
+            continue
+        try:
+            lock = _lock_session(upload_id)
+        except UploadSessionError:
+            live.add(upload_id)
+            continue
+        try:
+            _remove_session_files(upload_id)
+            removed += 1
+        finally:
+            _unlock_session(lock)
+
+    # Partial/lock files whose sidecar is gone (crash mid-create/complete)
+    mtime_cutoff = time.time() - ttl_seconds
+    for path in glob.glob(os.path.join(PARTIAL_DIR, "*.part")) + glob.glob(os.path.join(PARTIAL_DIR, "*.lock")):
+        upload_id = os.path.splitext(os.path.basename(path))[0]
+        if upload_id not in live and os.path.getmtime(path) < mtime_cutoff:
+            _remove_quietly(path)
+
+    # Hashers for sessions finished or swept by another worker
+    for upload_id in list(_hashers):
+        if not os.path.exists(os.path.join(PARTIAL_DIR, f"{upload_id}.json")):
+            _hashers.pop(upload_id, None)
+    if removed:
+        logger.info("Removed %s expired upload sessions", removed)
+    return removed
+
+def _maybe_sweep() -> None:
+    global _last_sweep
+    now = time.monotonic()
+    if UPLOAD_SESSION_TTL_SECONDS <= 0 or now - _last_sweep < SWEEP_INTERVAL_SECONDS:
+        return
+    _last_sweep = now
+    try:
+        sweep_expired_sessions()
+    except Exception:
+        logger.exception("Upload session sweep failed")
+
+def _received_bytes(part_path: str) -> int:
+    return os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+def max_bytes_exceeded(size_bytes: int) -> bool:
+    return bool(MAX_UPLOAD_BYTES) and size_bytes > MAX_UPLOAD_BYTES
+
+def create_session(original_filename: str, size_bytes: int, owner_id: str) -> Dict[str, Any]:
+    if max_bytes_exceeded(size_bytes):
+        raise UploadTooLarge(f"Upload exceeds {MAX_UPLOAD_BYTES} bytes")
+    _maybe_sweep()
+
+    upload_id = uuid.uuid4().hex
+    part_path, meta_path = _session_paths(upload_id)
+    session = {
+        "upload_id": upload_id,
+        "original_filename": original_filename,
+        "size_bytes": size_bytes,
+        "owner_id": owner_id,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(session, f)
+    open(part_path, "wb").close()
+    _hashers[upload_id] = (hashlib.sha256(), 0)
+    return {**session, "received_bytes": 0, "chunk_bytes": UPLOAD_CHUNK_BYTES}
+
+def get_session(upload_id: str) -> Dict[str, Any]:
+    part_path, meta_path = _session_paths(upload_id)
+    if not os.path.exists(meta_path):
+        raise UploadSessionError("Upload session not found")
+    with open(meta_path, "r", encoding="utf-8") as f:
+        session = json.load(f)
+    session["received_bytes"] = _received_bytes(part_path)
+    return session
+
+async def append_chunk(upload_id: str, offset: int, stream: AsyncIterator[bytes]) -> int:
+    """Append a streamed request body at `offset`; returns the new received size."""
+    lock = await run_in_threadpool(_lock_session, upload_id)
+    try:
+        return await _append_locked(upload_id, offset, stream)
+    finally:
+        await run_in_threadpool(_unlock_session, lock)
+
+async def _append_locked(upload_id: str, offset: int, stream: AsyncIterator[bytes]) -> int:
+    session = await run_in_threadpool(get_session, upload_id)
+    part_path, _ = _session_paths(upload_id)
+    received = session["received_bytes"]
+    if offset != received:
+        raise UploadSessionError(f"Expected offset {received}, got {offset}")
+
+    hasher, hashed = _hashers.get(upload_id, (None, -1))
+    if hashed != received:
+        hasher = None
+
+    f = await run_in_threadpool(open, part_path, "ab")
+    try:
+        async for chunk in stream:
+            if not chunk:
+                continue
+            received += len(chunk)
+            if received > session["size_bytes"] or max_bytes_exceeded(received):
+                await run_in_threadpool(f.truncate, offset)
+                raise UploadTooLarge("Chunk exceeds the declared upload size")
+            if hasher is not None:
+                await run_in_threadpool(_write_and_hash, f, hasher, chunk)
+            else:
+                await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        # Bytes already written stay put (the client resumes from the on-disk
+        # offset); the running hash can't be trusted any more.
+        _hashers.pop(upload_id, None)
+        raise
+    finally:
+        await run_in_threadpool(f.close)
+
+    if hasher is not None:
+        _hashers[upload_id] = (hasher, received)
+    else:
+        _hashers.pop(upload_id, None)
+    return received
+
+def _hash_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+async def complete_session(upload_id: str, dest_path: str) -> Tuple[Dict[str, Any], str]:
+    """Move a fully received upload to `dest_path`; returns (session, sha256)."""
+    lock = await run_in_threadpool(_lock_session, upload_id)
+    try:
+        return await _complete_locked(upload_id, dest_path)
+    finally:
+        await run_in_threadpool(_unlock_session, lock)
+
+async def _complete_locked(upload_id: str, dest_path: str) -> Tuple[Dict[str, Any], str]:
+    session = await run_in_threadpool(get_session, upload_id)
+    part_path, meta_path = _session_paths(upload_id)
+    if session["received_bytes"] != session["size_bytes"]:
+        raise UploadSessionError(
+            f"Upload incomplete: {session['received_bytes']} of {session['size_bytes']} bytes"
+        )
+
+    hasher, hashed = _hashers.pop(upload_id, (None, -1))
+    if hasher is not None and hashed == session["received_bytes"]:
+        sha256 = hasher.hexdigest()
+    else:
+        sha256 = await run_in_threadpool(_hash_file, part_path)
+
+    await run_in_threadpool(os.replace, part_path, dest_path)
+    await run_in_threadpool(_remove_session_files, upload_id)
+    return session, sha256
+
+async def abort_session(upload_id: str) -> None:
+    lock = await run_in_threadpool(_lock_session, upload_id)
+    try:
+        await run_in_threadpool(_remove_session_files, upload_id)
+    finally:
+        await run_in_threadpool(_unlock_session, lock)
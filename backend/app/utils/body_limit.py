@@ -0,0 +1,70 @@
+from typing import Iterable
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ----------------------------
+# Request body size limit
+# ----------------------------
+# Starlette spools a multipart body to disk before the route handler (or its
+# auth dependency) runs, so a size check inside the handler only fires after
+# the whole file has been received. This middleware rejects oversized bodies
+# up front: a declared Content-Length over the limit gets a 413 without the
+# body being read, and chunked/undeclared bodies are cut off as soon as the
+# running byte count crosses it.
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefixes: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.max_bytes
+            or scope["method"] not in {"POST", "PUT", "PATCH"}
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        try:
+            declared = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            declared = 0
+        if declared > self.max_bytes:
+            await _too_large(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing, so
+                    # this surfaces as a 413 rather than a generic 400
+                    raise HTTPException(status_code=413, detail="File too large")
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as exc:
+            if exc.status_code != 413 or response_started:
+                raise
+            await _too_large(scope, receive, send)
+
+async def _too_large(scope: Scope, receive: Receive, send: Send) -> None:
+    response = JSONResponse({"detail": "File too large"}, status_code=413, headers={"Connection": "close"})
+    await response(scope, receive, send)
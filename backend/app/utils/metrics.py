@@ -0,0 +1,133 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.config.settings import METRICS_ENABLED
+
+# Latency buckets in seconds, tuned for the spread between a FAISS lookup
+# (sub-millisecond) and a full OCR-heavy ingest (tens of seconds).
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_PREFIX = "insighthub_"
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_histograms: Dict[str, "_Histogram"] = {}
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+class _Timer:
+    __slots__ = ("name", "sink", "start", "elapsed")
+
+    def __init__(self, name: str, sink: Optional[Dict[str, float]]):
+        self.name = name
+        self.sink = sink
+        self.start = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self.start
+        if METRICS_ENABLED:
+            observe(self.name, self.elapsed)
+        if self.sink is not None:
+            self.sink[self.name] = self.sink.get(self.name, 0.0) + self.elapsed
+        return False
+
+class _NoopTimer:
+    __slots__ = ()
+    elapsed = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP_TIMER = _NoopTimer()
+
+def enabled() -> bool:
+    return METRICS_ENABLED
+
+def inc(name: str, value: float = 1.0) -> None:
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0.0) + value
+
+def observe(name: str, seconds: float) -> None:
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = _Histogram()
+        hist.observe(seconds)
+
+def timer(name: str, sink: Optional[Dict[str, float]] = None):
+    # `sink` accumulates elapsed seconds per stage name even when metrics are
+    # disabled, so callers can persist per-document timings regardless.
+    if not METRICS_ENABLED and sink is None:
+        return _NOOP_TIMER
+    return _Timer(name, sink)
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "timers": {
+                name: {"count": h.count, "sum": h.total}
+                for name, h in _histograms.items()
+            },
+        }
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    with _lock:
+        for name in sorted(_counters):
+            metric = f"{_PREFIX}{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {_format_value(_counters[name])}")
+
+        for name in sorted(_histograms):
+            hist = _histograms[name]
+            metric = f"{_PREFIX}{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {hist.count}')
+            lines.append(f"{metric}_sum {repr(hist.total)}")
+            lines.append(f"{metric}_count {hist.count}")
+    return "\n".join(lines) + "\n"
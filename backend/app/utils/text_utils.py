@@ -0,0 +1,31 @@
+import re
+from typing import List
+
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "you", "your", "are",
+    "was", "were", "have", "has", "had", "but", "not", "they", "their", "them",
+    "will", "would", "can", "could", "should", "about", "into", "over", "under",
+    "also", "than", "then", "such", "these", "those", "our", "out", "its", "it's",
+    "we", "he", "she", "his", "her", "who", "what", "when", "where", "why", "how",
+    "all", "any", "each", "few", "more", "most", "other", "some", "no", "nor",
+    "only", "own", "same", "so", "too", "very", "a", "an", "in", "on", "of", "to",
+    "is", "it", "as", "at", "by", "be", "or", "if", "up", "down", "off", "per",
+}
+
+# Lowercase word/number tokens; decimals like "412.5" stay one token so exact
+# figures can be looked up.
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+def content_tokens(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS]
+
+# Rough LLM token count: words, numbers and punctuation marks each count as
+# one. Close to BPE counts for English prose and tables without needing the
+# model's tokenizer.
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: str) -> int:
+    return len(_PIECE_RE.findall(text))
@@ -3,6 +3,7 @@ import numpy as np
 import os
 import json
 from typing import Any, Dict, List, Tuple
+from app.vector_store import lexical_index
 
 index = faiss.IndexFlatL2(384)
 metadata_store: List[Dict[str, Any]] = []
@@ -26,6 +27,7 @@ def load_index() -> None:
             else:
                 metadata_store = data.get("metadata", [])
                 embedding_store = data.get("embeddings", [])
+    lexical_index.rebuild(metadata_store)
 
 def save_index() -> None:
     os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
@@ -61,6 +63,8 @@ def remove_document(doc_id: str) -> int:
     index = faiss.IndexFlatL2(384)
     if embedding_store:
         index.add(np.array(embedding_store))
+    # Positions shifted, so the lexical index is rebuilt against the new ids
+    lexical_index.rebuild(metadata_store)
 
     save_index()
     return len(embedding_store)
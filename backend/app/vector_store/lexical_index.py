@@ -0,0 +1,87 @@
+import heapq
+import math
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from app.utils.text_utils import tokenize
+
+# ----------------------------
+# In-memory BM25 inverted index over chunk text
+# ----------------------------
+# Chunk ids are positions in faiss_index.metadata_store, so lexical and dense
+# hits refer to the same chunk. Postings are compact typed arrays (chunk ids
+# and term frequencies) appended to as chunks are ingested; remove_document
+# compacts the FAISS positions, so deletes rebuild the index from the
+# surviving metadata.
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_lock = threading.Lock()
+_postings: Dict[str, Tuple[array, array]] = {}
+_doc_lengths = array("I")
+_chunk_doc_ids: List[Optional[str]] = []
+_total_length = 0
+
+def _add_locked(chunk_id: int, doc_id: Optional[str], text: str) -> None:
+    global _total_length
+    # Positions can only grow by one; pad if a chunk arrives out of order
+    while len(_doc_lengths) < chunk_id:
+        _doc_lengths.append(0)
+        _chunk_doc_ids.append(None)
+
+    tokens = tokenize(text)
+    if chunk_id < len(_doc_lengths):
+        _doc_lengths[chunk_id] = len(tokens)
+        _chunk_doc_ids[chunk_id] = doc_id
+    else:
+        _doc_lengths.append(len(tokens))
+        _chunk_doc_ids.append(doc_id)
+    _total_length += len(tokens)
+
+    for term, tf in Counter(tokens).items():
+        postings = _postings.get(term)
+        if postings is None:
+            postings = _postings[term] = (array("I"), array("I"))
+        postings[0].append(chunk_id)
+        postings[1].append(tf)
+
+def add(chunk_id: int, doc_id: Optional[str], text: str) -> None:
+    with _lock:
+        _add_locked(chunk_id, doc_id, text)
+
+def rebuild(metadata: List[Dict[str, Any]]) -> None:
+    global _postings, _doc_lengths, _chunk_doc_ids, _total_length
+    with _lock:
+        _postings = {}
+        _doc_lengths = array("I")
+        _chunk_doc_ids = []
+        _total_length = 0
+        for chunk_id, meta in enumerate(metadata):
+            _add_locked(chunk_id, meta.get("doc_id"), meta.get("text") or "")
+
+def size() -> int:
+    return len(_doc_lengths)
+
+def search(query: str, k: int = 5, doc_id: Optional[str] = None) -> List[Tuple[int, float]]:
+    """Top-k (chunk_id, bm25 score), optionally restricted to one document."""
+    terms = set(tokenize(query))
+    with _lock:
+        n_chunks = len(_doc_lengths)
+        if not n_chunks or not terms:
+            return []
+        avg_length = (_total_length / n_chunks) or 1.0
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = _postings.get(term)
+            if postings is None:
+                continue
+            ids, tfs = postings
+            idf = math.log(1 + (n_chunks - len(ids) + 0.5) / (len(ids) + 0.5))
+            for chunk_id, tf in zip(ids, tfs):
+                if doc_id is not None and _chunk_doc_ids[chunk_id] != doc_id:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * _doc_lengths[chunk_id] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+    return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,141 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.run import latency_summary
+
+# ----------------------------
+# Locally minted Firebase-style ID tokens
+# ----------------------------
+# Tokens are RS256-signed with a throwaway key and verified with the same
+# google-auth code path firebase_admin uses, so the benchmark measures real
+# signature verification without a Firebase project or network access.
+
+PROJECT_ID = "insight-hub-bench"
+KEY_ID = "bench-key"
+
+def _make_signing_material():
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    from google.auth import crypt
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "bench")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    signer = crypt.RSASigner.from_string(key_pem, key_id=KEY_ID)
+    certs = {KEY_ID: cert.public_bytes(serialization.Encoding.PEM).decode()}
+    return signer, certs
+
+def mint_token(signer, uid: str, ttl_seconds: int = 3600) -> str:
+    from google.auth import jwt
+
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": uid,
+        "user_id": uid,
+        "iat": now,
+        "auth_time": now,
+        "exp": now + ttl_seconds,
+    }
+    return jwt.encode(signer, payload).decode()
+
+def make_local_verifier(certs: Dict[str, str]):
+    from google.auth import jwt
+
+    def verify_id_token(token, app=None, check_revoked=False, clock_skew_seconds=0):
+        claims = jwt.decode(token, certs=certs, audience=PROJECT_ID)
+        claims["uid"] = claims["sub"]
+        return claims
+
+    return verify_id_token
+
+# ----------------------------
+# Benchmark
+# ----------------------------
+def _measure(verify, headers: List[str], requests: int, rng: random.Random) -> List[float]:
+    seconds: List[float] = []
+    for _ in range(requests):
+        header = rng.choice(headers)
+        started = time.perf_counter()
+        verify(header)
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.auth import verify_token
+
+    signer, certs = _make_signing_material()
+    verify_token.auth.verify_id_token = make_local_verifier(certs)
+    verify_token.CERT_REFRESH_ENABLED = False
+
+    headers = [f"Bearer {mint_token(signer, f'user-{i}')}" for i in range(args.users)]
+    results: Dict[str, Any] = {
+        "params": {
+            "users": args.users,
+            "requests": args.requests,
+            "cache_size": args.cache_size,
+            "seed": args.seed,
+        },
+    }
+
+    for label, cache_size in (("uncached", 0), ("cached", args.cache_size)):
+        verify_token.TOKEN_CACHE_SIZE = cache_size
+        verify_token.clear_token_cache()
+        hits_before = _counter("auth_token_cache_hits")
+        misses_before = _counter("auth_token_cache_misses")
+        seconds = _measure(
+            verify_token.verify_firebase_token, headers, args.requests, random.Random(args.seed)
+        )
+        hits = _counter("auth_token_cache_hits") - hits_before
+        misses = _counter("auth_token_cache_misses") - misses_before
+        results[label] = {
+            **latency_summary(seconds),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "cache_entries": verify_token.token_cache_size(),
+        }
+    return results
+
+def _counter(name: str) -> float:
+    from app.utils import metrics
+
+    return metrics.snapshot()["counters"].get(name, 0.0)
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="ID-token verification cache benchmark")
+    parser.add_argument("--users", type=int, default=50, help="Distinct tokens in rotation")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args), indent=2))
+
+if __name__ == "__main__":
+    main()
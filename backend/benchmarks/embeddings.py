@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.run import latency_summary, peak_rss_mb
+from benchmarks.synthetic import _paragraph
+
+# ----------------------------
+# Embedding backend throughput and parity
+# ----------------------------
+# Encodes the same synthetic texts (a spread of lengths, like real chunks and
+# questions) with each backend. Reports single-text latency, batched
+# throughput, and cosine similarity against the stock torch model. The run
+# exits non-zero if a backend falls below --min-cosine, so it doubles as the
+# parity check for the ONNX exports.
+
+BACKENDS = ["torch", "onnx", "onnx-int8"]
+
+def _texts(rng: random.Random, count: int) -> List[str]:
+    return [_paragraph(rng, sentences=rng.randint(1, 30)) for _ in range(count)]
+
+def _cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.ai import embeddings
+
+    embeddings.EMBEDDING_THREADS = args.threads
+    rng = random.Random(args.seed)
+    texts = _texts(rng, args.texts)
+    queries = [f"What was the revenue of company {i} in 2020?" for i in range(args.queries)]
+
+    reference = None
+    results: Dict[str, Any] = {}
+    for backend in args.backends:
+        try:
+            load_started = time.perf_counter()
+            model = embeddings.load_model(backend)
+            load_seconds = time.perf_counter() - load_started
+        except Exception as exc:
+            results[backend] = {"error": str(exc)}
+            continue
+
+        model.encode(texts[: args.batch_size], batch_size=args.batch_size)  # warm up
+        query_seconds: List[float] = []
+        for q in queries:
+            started = time.perf_counter()
+            model.encode(q)
+            query_seconds.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        vectors = np.asarray(model.encode(texts, batch_size=args.batch_size))
+        batch_seconds = time.perf_counter() - started
+
+        entry: Dict[str, Any] = {
+            "load_seconds": round(load_seconds, 3),
+            "single_text": latency_summary(query_seconds),
+            "batch_texts_per_sec": round(len(texts) / batch_seconds, 2) if batch_seconds else 0.0,
+        }
+        if backend == "torch":
+            reference = vectors
+        if reference is not None:
+            cos = _cosines(reference, vectors)
+            entry["parity"] = {
+                "min_cosine": round(float(cos.min()), 6),
+                "mean_cosine": round(float(cos.mean()), 6),
+                "ok": bool(cos.min() >= args.min_cosine),
+            }
+        results[backend] = entry
+
+    return {
+        "params": {
+            "texts": args.texts,
+            "queries": args.queries,
+            "batch_size": args.batch_size,
+            "threads": args.threads,
+            "min_cosine": args.min_cosine,
+            "seed": args.seed,
+        },
+        "backends": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Embedding backend throughput and parity benchmark")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS,
+                        help="Backends to compare; parity is measured against torch, so list it first")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = library default)")
+    parser.add_argument("--min-cosine", type=float, default=0.98,
+                        help="Fail if any text's embedding falls below this cosine vs torch")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    failed = [
+        name for name, entry in results["backends"].items()
+        if entry.get("parity") and not entry["parity"]["ok"]
+    ]
+    if failed:
+        sys.exit(f"Embedding parity below {args.min_cosine}: {', '.join(failed)}")
+
+if __name__ == "__main__":
+    main()
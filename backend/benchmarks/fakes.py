@@ -0,0 +1,161 @@
+import sys
+import time
+import types
+import uuid
+from typing import Any, Dict, List, Optional
+from app.utils.text_utils import estimate_tokens
+
+# ----------------------------
+# In-memory Firestore stand-in
+# ----------------------------
+# Implements just the subset of the google-cloud-firestore client that the
+# backend uses (collection/document/set/get/add/delete/stream/where/limit and
+# batched writes), so FirestoreStore can be exercised without a Firebase project.
+
+class _Snapshot:
+    def __init__(self, reference: "_DocumentRef", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+class _DocumentRef:
+    def __init__(self, collection: "_CollectionRef", doc_id: str):
+        self._collection = collection
+        self.id = doc_id
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        store = self._collection._docs
+        if merge and self.id in store:
+            store[self.id].update(data)
+        else:
+            store[self.id] = dict(data)
+        self._collection._client.writes += 1
+
+    def get(self) -> _Snapshot:
+        self._collection._client.reads += 1
+        return _Snapshot(self, self._collection._docs.get(self.id))
+
+    def delete(self) -> None:
+        self._collection._docs.pop(self.id, None)
+        self._collection._client.writes += 1
+
+_OPS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+}
+
+class _Query:
+    def __init__(self, collection: "_CollectionRef", filters: List[tuple], limit: Optional[int] = None):
+        self._collection = collection
+        self._filters = filters
+        self._limit = limit
+
+    def where(self, *args, filter=None) -> "_Query":
+        if filter is not None:
+            clause = (filter.field_path, filter.op_string, filter.value)
+        else:
+            clause = tuple(args)
+        return _Query(self._collection, self._filters + [clause], self._limit)
+
+    def limit(self, count: int) -> "_Query":
+        return _Query(self._collection, self._filters, count)
+
+    def stream(self):
+        client = self._collection._client
+        returned = 0
+        for doc_id, data in list(self._collection._docs.items()):
+            if self._limit is not None and returned >= self._limit:
+                return
+            if all(_OPS[op](data.get(field), value) for field, op, value in self._filters):
+                client.reads += 1
+                returned += 1
+                yield _Snapshot(_DocumentRef(self._collection, doc_id), data)
+
+class _CollectionRef(_Query):
+    def __init__(self, client: "InMemoryFirestore", name: str):
+        self._client = client
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        super().__init__(self, [])
+
+    def document(self, doc_id: Optional[str] = None) -> _DocumentRef:
+        return _DocumentRef(self, doc_id or uuid.uuid4().hex)
+
+    def add(self, data: Dict[str, Any]):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+class _WriteBatch:
+    def __init__(self):
+        self._ops: List[tuple] = []
+
+    def set(self, ref: _DocumentRef, data: Dict[str, Any], merge: bool = False) -> None:
+        self._ops.append((ref.set, (data, merge)))
+
+    def delete(self, ref: _DocumentRef) -> None:
+        self._ops.append((ref.delete, ()))
+
+    def commit(self) -> None:
+        for op, args in self._ops:
+            op(*args)
+        self._ops = []
+
+class InMemoryFirestore:
+    def __init__(self):
+        self._collections: Dict[str, _CollectionRef] = {}
+        self.reads = 0
+        self.writes = 0
+
+    def collection(self, name: str) -> _CollectionRef:
+        if name not in self._collections:
+            self._collections[name] = _CollectionRef(self, name)
+        return self._collections[name]
+
+    def batch(self) -> _WriteBatch:
+        return _WriteBatch()
+
+def install_fake_firebase() -> InMemoryFirestore:
+    """Register an in-memory `app.config.firebase` before the app imports it."""
+    db = InMemoryFirestore()
+    module = types.ModuleType("app.config.firebase")
+    module.db = db
+    module.bucket = None
+    sys.modules["app.config.firebase"] = module
+    return db
+
+# ----------------------------
+# Groq stand-in
+# ----------------------------
+# Latency is a fixed part plus a per-prompt-token part, so prompt size shows
+# up in end-to-end /qa timings the way prefill time does with the real API
+class FakeGroq:
+    def __init__(self, latency_ms: float = 0.0, ms_per_1k_tokens: float = 0.0):
+        self.latency_ms = latency_ms
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.calls = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.last_prompt = ""
+
+    def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        tokens = estimate_tokens(prompt)
+        self.prompt_tokens += tokens
+        self.last_prompt = prompt
+        delay_ms = self.latency_ms + self.ms_per_1k_tokens * tokens / 1000.0
+        if delay_ms:
+            time.sleep(delay_ms / 1000.0)
+        return "Synthetic answer."
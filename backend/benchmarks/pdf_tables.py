@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic import make_pdf
+
+# ----------------------------
+# PDF table extraction: gated vs ungated
+# ----------------------------
+# Parses table-free, decorated (borders, callout boxes, highlights, dividers
+# but no tables) and table-heavy synthetic corpora with each table strategy.
+# Reports parse throughput, how many tables were found and how many pages
+# the pre-check skipped, so speedups can be checked against lost tables.
+
+MODES = {
+    "pdfplumber_ungated": ("pdfplumber", False),
+    "pdfplumber_gated": ("pdfplumber", True),
+    "pymupdf_gated": ("pymupdf", True),
+    "off": ("off", False),
+}
+
+def _parse_corpus(paths: List[str], extractor: str, gating: bool) -> Dict[str, Any]:
+    from app.processing.parser import _extract_pdf
+
+    from app.utils import metrics
+
+    metrics.reset()
+    pages = tables = 0
+    started = time.perf_counter()
+    for path in paths:
+        for page in _extract_pdf(path, table_extractor=extractor, table_gating=gating):
+            pages += 1
+            tables += page["text"].count(" JSON]\n")
+    wall = time.perf_counter() - started
+    counters = metrics.snapshot()["counters"]
+    return {
+        "wall_seconds": round(wall, 3),
+        "pages_per_sec": round(pages / wall, 2) if wall else 0.0,
+        "tables_found": tables,
+        "pages_skipped": int(counters.get("parse_pdf_table_pages_skipped", 0)),
+    }
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    work_dir = tempfile.mkdtemp(prefix="insighthub-tables-")
+    corpora = {
+        "table_free": [
+            make_pdf(os.path.join(work_dir, f"plain_{i:03d}.pdf"), rng, args.pages, table_every=0)["path"]
+            for i in range(args.docs)
+        ],
+        "decorated": [
+            make_pdf(os.path.join(work_dir, f"decorated_{i:03d}.pdf"), rng, args.pages,
+                     table_every=0, decorations=True)["path"]
+            for i in range(args.docs)
+        ],
+        "table_heavy": [
+            make_pdf(os.path.join(work_dir, f"tables_{i:03d}.pdf"), rng, args.pages, table_every=1)["path"]
+            for i in range(args.docs)
+        ],
+    }
+
+    results: Dict[str, Any] = {
+        "params": {"docs": args.docs, "pages": args.pages, "seed": args.seed},
+    }
+    for corpus_name, paths in corpora.items():
+        results[corpus_name] = {
+            mode: _parse_corpus(paths, *MODES[mode]) for mode in args.modes
+        }
+    return results
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="PDF table extraction benchmark")
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import install_fake_firebase
+from benchmarks.run import latency_summary
+from benchmarks.synthetic import make_corpus
+
+# ----------------------------
+# Retrieval quality/latency by mode
+# ----------------------------
+# Ingests a synthetic corpus once, then runs every document's natural-language
+# question and its exact-figure keyword query through each retrieval mode.
+# A query is a hit when a chunk of its source document is in the top 5; MRR
+# uses the rank of the first such chunk.
+
+MODES = ["dense", "lexical", "hybrid", "auto"]
+
+def _score(ranking: List[int], expected_doc: str, metadata: List[Dict[str, Any]]) -> float:
+    for rank, i in enumerate(ranking):
+        if metadata[i].get("doc_id") == expected_doc:
+            return 1.0 / (rank + 1)
+    return 0.0
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="insighthub-retrieval-")
+    index_dir = os.path.join(work_dir, "vector_store")
+    os.makedirs(index_dir, exist_ok=True)
+    install_fake_firebase()
+
+    from app.vector_store import faiss_index, lexical_index
+    from app.processing.pipeline import process_document
+    from app.ai import rag
+    from app.services import storage
+    from app.services.sqlite_store import SQLiteStore
+
+    storage.set_store(SQLiteStore(os.path.join(work_dir, "metadata.db")))
+    faiss_index.INDEX_PATH = os.path.join(index_dir, "faiss.index")
+    faiss_index.META_PATH = os.path.join(index_dir, "faiss_meta.json")
+    faiss_index.index.reset()
+    faiss_index.metadata_store.clear()
+    faiss_index.embedding_store.clear()
+    lexical_index.rebuild([])
+
+    corpus = make_corpus(
+        os.path.join(work_dir, "corpus"),
+        seed=args.seed,
+        pdf_docs=args.pdf_docs,
+        docx_docs=0,
+        pages=args.pages,
+        table_every=args.table_every,
+        image_every=0,
+    )
+    for item in corpus:
+        process_document(os.path.basename(item["path"]), item["path"])
+    rag.embed("warm up")
+
+    query_sets = {
+        "natural": [(item["question"], os.path.basename(item["path"])) for item in corpus],
+        "keyword": [(item["keyword_query"], os.path.basename(item["path"])) for item in corpus],
+    }
+    results: Dict[str, Any] = {}
+    for mode in MODES:
+        results[mode] = {}
+        for name, queries in query_sets.items():
+            seconds: List[float] = []
+            reciprocal_ranks: List[float] = []
+            for _ in range(args.repeat):
+                for question, expected_doc in queries:
+                    started = time.perf_counter()
+                    ranking = rag._retrieve_indices(question, None, mode)
+                    seconds.append(time.perf_counter() - started)
+                    reciprocal_ranks.append(_score(ranking, expected_doc, faiss_index.metadata_store))
+            results[mode][name] = {
+                **latency_summary(seconds),
+                "hit_rate": round(sum(1 for r in reciprocal_ranks if r) / len(reciprocal_ranks), 4),
+                "mrr": round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4),
+            }
+
+    return {
+        "params": {
+            "seed": args.seed,
+            "pdf_docs": args.pdf_docs,
+            "pages": args.pages,
+            "table_every": args.table_every,
+            "repeat": args.repeat,
+        },
+        "chunks": len(faiss_index.metadata_store),
+        "lexical_terms": len(lexical_index._postings),
+        "modes": results,
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Dense vs BM25 vs hybrid retrieval benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pdf-docs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--table-every", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Run each query this many times for latency percentiles")
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    return parser
+
+def main(argv: List[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    payload = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    print(payload)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module; peak RSS comes from psutil if installed
+    resource = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import FakeGroq, install_fake_firebase
+from benchmarks.synthetic import make_corpus
+
+# ----------------------------
+# Helpers
+# ----------------------------
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    ms = [s * 1000.0 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        # peak_wset is Windows' peak working set, in bytes
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 2)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 2)
+    return round(peak / 1024, 2)
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+# ----------------------------
+# Benchmark
+# ----------------------------
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="insighthub-bench-")
+    corpus_dir = os.path.join(work_dir, "corpus")
+    index_dir = os.path.join(work_dir, "vector_store")
+    os.makedirs(index_dir, exist_ok=True)
+
+    db = install_fake_firebase()
+
+    # Imported after the Firestore stand-in is registered
+    from app.vector_store import faiss_index, lexical_index
+    from app.processing.pipeline import process_document
+    from app.ai import rag
+    from app.services import storage
+    from app.utils import metrics
+
+    if args.store == "sqlite":
+        from app.services.sqlite_store import SQLiteStore
+        store = SQLiteStore(os.path.join(work_dir, "metadata.db"))
+    else:
+        from app.services.firestore import FirestoreStore
+        store = FirestoreStore(db)
+    storage.set_store(store)
+
+    faiss_index.INDEX_PATH = os.path.join(index_dir, "faiss.index")
+    faiss_index.META_PATH = os.path.join(index_dir, "faiss_meta.json")
+    faiss_index.index.reset()
+    faiss_index.metadata_store.clear()
+    faiss_index.embedding_store.clear()
+    lexical_index.rebuild([])
+
+    groq = FakeGroq(latency_ms=args.groq_latency_ms, ms_per_1k_tokens=args.groq_ms_per_1k_tokens)
+    rag.ask_groq = groq
+    if args.context_budget is not None:
+        rag.CONTEXT_TOKEN_BUDGET = args.context_budget
+
+    gen_started = time.perf_counter()
+    corpus = make_corpus(
+        corpus_dir,
+        seed=args.seed,
+        pdf_docs=args.pdf_docs,
+        docx_docs=args.docx_docs,
+        pages=args.pages,
+        table_every=args.table_every,
+        image_every=args.image_every,
+    )
+    generate_seconds = time.perf_counter() - gen_started
+
+    # Warm up model loading so it doesn't count against the first document
+    rag.embed("warm up")
+    metrics.reset()
+
+    ingest_seconds: List[float] = []
+    total_pages = 0
+    ingest_started = time.perf_counter()
+    for item in corpus:
+        doc_id = os.path.basename(item["path"])
+        started = time.perf_counter()
+        process_document(doc_id, item["path"])
+        ingest_seconds.append(time.perf_counter() - started)
+        record = store.get_document(doc_id) or {}
+        total_pages += int(record.get("page_count") or 0)
+    ingest_wall = time.perf_counter() - ingest_started
+    total_chunks = len(faiss_index.metadata_store)
+
+    rng = random.Random(args.seed)
+    questions = [
+        (item["question"], os.path.basename(item["path"]), item["keyword_query"].strip('"'))
+        for item in corpus
+    ]
+    query_seconds: List[float] = []
+    hits = 0
+    fact_in_prompt = 0
+    for i in range(args.queries):
+        question, expected_doc, fact = questions[i % len(questions)]
+        calls = groq.calls
+        scoped = args.scoped_fraction and rng.random() < args.scoped_fraction
+        started = time.perf_counter()
+        result = rag.rag_answer(question, expected_doc if scoped else None)
+        query_seconds.append(time.perf_counter() - started)
+        if any(e.get("documentName") == expected_doc for e in result.get("evidence", [])):
+            hits += 1
+        # Whether the answer-bearing figure made it into the prompt at all
+        if groq.calls > calls and fact in groq.last_prompt:
+            fact_in_prompt += 1
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "params": {
+            "seed": args.seed,
+            "store": args.store,
+            "pdf_docs": args.pdf_docs,
+            "docx_docs": args.docx_docs,
+            "pages": args.pages,
+            "table_every": args.table_every,
+            "image_every": args.image_every,
+            "queries": args.queries,
+            "scoped_fraction": args.scoped_fraction,
+            "groq_latency_ms": args.groq_latency_ms,
+            "groq_ms_per_1k_tokens": args.groq_ms_per_1k_tokens,
+            "context_budget": rag.CONTEXT_TOKEN_BUDGET,
+        },
+        "corpus": {
+            "documents": len(corpus),
+            "generate_seconds": round(generate_seconds, 3),
+        },
+        "ingest": {
+            "wall_seconds": round(ingest_wall, 3),
+            "pages": total_pages,
+            "chunks": total_chunks,
+            "pages_per_sec": round(total_pages / ingest_wall, 3) if ingest_wall else 0.0,
+            "chunks_per_sec": round(total_chunks / ingest_wall, 3) if ingest_wall else 0.0,
+            "per_document": latency_summary(ingest_seconds),
+        },
+        "query": {
+            **latency_summary(query_seconds),
+            "evidence_hit_rate": round(hits / len(query_seconds), 4) if query_seconds else 0.0,
+            "avg_prompt_chars": round(groq.prompt_chars / groq.calls, 1) if groq.calls else 0.0,
+            "avg_prompt_tokens": round(groq.prompt_tokens / groq.calls, 1) if groq.calls else 0.0,
+            "fact_in_prompt_rate": round(fact_in_prompt / len(query_seconds), 4) if query_seconds else 0.0,
+        },
+        "index": {
+            "vectors": int(faiss_index.index.ntotal),
+            "faiss_bytes": _file_size(faiss_index.INDEX_PATH),
+            "meta_bytes": _file_size(faiss_index.META_PATH),
+        },
+        "firestore": {"reads": db.reads, "writes": db.writes} if args.store == "firestore" else None,
+        "stages": metrics.snapshot(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Offline ingestion/retrieval benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--store", choices=["firestore", "sqlite"], default="sqlite",
+                        help="Metadata backend: in-memory Firestore stand-in or a temp SQLite file")
+    parser.add_argument("--pdf-docs", type=int, default=10)
+    parser.add_argument("--docx-docs", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--table-every", type=int, default=2,
+                        help="Draw a table on every Nth page (0 disables tables)")
+    parser.add_argument("--image-every", type=int, default=0,
+                        help="Embed an image on every Nth page (0 disables images/OCR)")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--scoped-fraction", type=float, default=0.0,
+                        help="Fraction of queries scoped to their source document")
+    parser.add_argument("--groq-latency-ms", type=float, default=0.0,
+                        help="Simulated LLM latency for the Groq stand-in")
+    parser.add_argument("--groq-ms-per-1k-tokens", type=float, default=0.0,
+                        help="Extra simulated latency per 1000 prompt tokens")
+    parser.add_argument("--context-budget", type=int, default=None,
+                        help="Override CONTEXT_TOKEN_BUDGET (0 = raw 300-char snippets)")
+    parser.add_argument("--work-dir", default=None,
+                        help="Directory for the generated corpus and index (default: temp dir)")
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    return parser
+
+def main(argv: List[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    results = run(args)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    print(payload)
+
+if __name__ == "__main__":
+    main()
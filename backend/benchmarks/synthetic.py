@@ -0,0 +1,174 @@
+import os
+import random
+from typing import Dict, List, Tuple
+import fitz  # PyMuPDF
+
+# ----------------------------
+# Synthetic corpus generation
+# ----------------------------
+# Documents are seeded so the same arguments always produce the same corpus,
+# which keeps benchmark numbers comparable across commits.
+
+WORDS = (
+    "market revenue growth quarter margin customer product segment operating "
+    "capital expense forecast strategy supply demand region digital platform "
+    "service contract pricing inventory logistics investment risk compliance "
+    "research development partner channel retail wholesale energy software "
+    "hardware network cloud security analytics portfolio dividend earnings"
+).split()
+
+COMPANY_PREFIXES = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay"]
+COMPANY_SUFFIXES = ["Holdings", "Industries", "Systems", "Group", "Labs", "Partners"]
+METRICS = ["revenue", "operating margin", "headcount", "net income", "capital expenditure"]
+
+def _sentence(rng: random.Random, length: int = 14) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return " ".join(words).capitalize() + "."
+
+def _paragraph(rng: random.Random, sentences: int = 6) -> str:
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+def _company(rng: random.Random) -> str:
+    return f"{rng.choice(COMPANY_PREFIXES)} {rng.choice(COMPANY_SUFFIXES)}"
+
+def _fact(rng: random.Random, company: str) -> Tuple[str, str, str]:
+    metric = rng.choice(METRICS)
+    year = rng.randint(2005, 2024)
+    value = f"{rng.randint(10, 999)}.{rng.randint(0, 9)}"
+    statement = f"{company} reported {metric} of {value} million in {year}."
+    question = f"What was the {metric} of {company} in {year}?"
+    # Exact-figure lookup, the kind of query dense retrieval handles poorly
+    keyword_query = f'"{value} million"'
+    return statement, question, keyword_query
+
+def _table_rows(rng: random.Random, rows: int = 5, cols: int = 4) -> List[List[str]]:
+    header = ["Year"] + [m.title() for m in rng.sample(METRICS, cols - 1)]
+    body = [
+        [str(2015 + r)] + [str(rng.randint(100, 9999)) for _ in range(cols - 1)]
+        for r in range(rows - 1)
+    ]
+    return [header] + body
+
+def _png_bytes(rng: random.Random, width: int = 240, height: int = 120) -> bytes:
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pix.clear_with(255)
+    for x in range(0, width, 24):
+        bar = rng.randint(10, height - 10)
+        pix.set_rect(fitz.IRect(x + 4, height - bar, x + 20, height), (40, 90, 200))
+    return pix.tobytes("png")
+
+def _draw_table(page, top: float, rows: List[List[str]]) -> float:
+    left, cell_w, cell_h = 50, 120, 20
+    n_rows, n_cols = len(rows), len(rows[0])
+    for r in range(n_rows + 1):
+        y = top + r * cell_h
+        page.draw_line((left, y), (left + n_cols * cell_w, y))
+    for c in range(n_cols + 1):
+        x = left + c * cell_w
+        page.draw_line((x, top), (x, top + n_rows * cell_h))
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            page.insert_text((left + c * cell_w + 4, top + r * cell_h + 14), cell, fontsize=9)
+    return top + n_rows * cell_h
+
+def _draw_decorations(page, rng: random.Random) -> None:
+    # Non-table vector art typical of real reports: page border, a shaded
+    # callout box, a text highlight and a horizontal divider
+    width, height = page.rect.width, page.rect.height
+    page.draw_rect(fitz.Rect(20, 20, width - 20, height - 20), color=(0.6, 0.6, 0.6))
+    top = rng.uniform(380, 520)
+    page.draw_rect(fitz.Rect(60, top, width - 60, top + 80), color=(0.2, 0.3, 0.6), fill=(0.9, 0.93, 1.0))
+    page.insert_textbox(fitz.Rect(70, top + 10, width - 70, top + 70), _sentence(rng), fontsize=10)
+    page.draw_rect(fitz.Rect(50, 120, rng.uniform(200, 400), 134), color=None, fill=(1, 1, 0.6), fill_opacity=0.5)
+    page.draw_line((50, height - 60), (width - 50, height - 60))
+
+def make_pdf(
+    path: str,
+    rng: random.Random,
+    pages: int = 5,
+    table_every: int = 2,
+    image_every: int = 0,
+    decorations: bool = False,
+) -> Dict[str, object]:
+    company = _company(rng)
+    statement, question, keyword_query = _fact(rng, company)
+    fact_page = rng.randrange(pages)
+
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        y = 50
+        if i == 0:
+            page.insert_text((50, y), f"{company} Annual Report", fontsize=16)
+            y += 30
+        body = _paragraph(rng)
+        if i == fact_page:
+            body = f"{body} {statement} {_paragraph(rng, 2)}"
+        rect = fitz.Rect(50, y, page.rect.width - 50, y + 300)
+        page.insert_textbox(rect, body, fontsize=10)
+        y += 310
+        if table_every and i % table_every == 0:
+            y = _draw_table(page, y, _table_rows(rng)) + 20
+        if image_every and i % image_every == 0 and y + 130 < page.rect.height:
+            page.insert_image(fitz.Rect(50, y, 290, y + 120), stream=_png_bytes(rng))
+        if decorations:
+            _draw_decorations(page, rng)
+    doc.save(path)
+    doc.close()
+
+    return {"path": path, "pages": pages, "company": company, "question": question,
+            "keyword_query": keyword_query}
+
+def make_docx(
+    path: str,
+    rng: random.Random,
+    paragraphs: int = 20,
+    tables: int = 2,
+    images: int = 0,
+) -> Dict[str, object]:
+    import io
+    from docx import Document
+
+    company = _company(rng)
+    statement, question, keyword_query = _fact(rng, company)
+    fact_index = rng.randrange(paragraphs)
+
+    doc = Document()
+    doc.add_heading(f"{company} Annual Report", level=1)
+    for i in range(paragraphs):
+        text = _paragraph(rng)
+        if i == fact_index:
+            text = f"{text} {statement}"
+        doc.add_paragraph(text)
+    for _ in range(tables):
+        rows = _table_rows(rng)
+        table = doc.add_table(rows=len(rows), cols=len(rows[0]))
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                table.cell(r, c).text = cell
+    for _ in range(images):
+        doc.add_picture(io.BytesIO(_png_bytes(rng)))
+    doc.save(path)
+
+    return {"path": path, "pages": 1, "company": company, "question": question,
+            "keyword_query": keyword_query}
+
+def make_corpus(
+    out_dir: str,
+    seed: int = 0,
+    pdf_docs: int = 10,
+    docx_docs: int = 2,
+    pages: int = 5,
+    table_every: int = 2,
+    image_every: int = 0,
+) -> List[Dict[str, object]]:
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    corpus: List[Dict[str, object]] = []
+    for i in range(pdf_docs):
+        path = os.path.join(out_dir, f"synthetic_{i:04d}.pdf")
+        corpus.append(make_pdf(path, rng, pages, table_every, image_every))
+    for i in range(docx_docs):
+        path = os.path.join(out_dir, f"synthetic_{i:04d}.docx")
+        corpus.append(make_docx(path, rng, images=1 if image_every else 0))
+    return corpus
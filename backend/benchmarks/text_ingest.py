@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import install_fake_firebase
+from benchmarks.run import peak_rss_mb
+from benchmarks.synthetic import _paragraph, _sentence
+
+# ----------------------------
+# Large TXT/MD ingestion throughput
+# ----------------------------
+# Writes a seeded markdown dump or log export of --size-mb, then streams it
+# through parse + chunk (no embedding) to measure MB/s and show that peak RSS
+# doesn't grow with file size. A smaller --ingest-mb file is run through the
+# full process_document path (embedding, FAISS, SQLite) for end-to-end numbers.
+
+def _write_markdown(path: str, size_bytes: int, rng: random.Random) -> None:
+    written = 0
+    section = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            section += 1
+            parts = [f"## Section {section}\n\n"]
+            for _ in range(rng.randint(1, 6)):
+                parts.append(_paragraph(rng, sentences=rng.randint(2, 10)) + "\n\n")
+            block = "".join(parts)
+            f.write(block)
+            written += len(block)
+
+def _write_log(path: str, size_bytes: int, rng: random.Random) -> None:
+    written = 0
+    line_no = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_bytes:
+            lines = []
+            for _ in range(1000):
+                line_no += 1
+                level = rng.choice(["INFO", "INFO", "INFO", "WARN", "ERROR"])
+                lines.append(f"2024-01-01T00:00:{line_no % 60:02d}Z {level} worker-{rng.randint(1, 16)} {_sentence(rng)}\n")
+            block = "".join(lines)
+            f.write(block)
+            written += len(block)
+
+def _make_file(work_dir: str, kind: str, size_mb: float, seed: int) -> str:
+    ext = ".md" if kind == "markdown" else ".txt"
+    path = os.path.join(work_dir, f"{kind}-{size_mb:g}mb{ext}")
+    writer = _write_markdown if kind == "markdown" else _write_log
+    writer(path, int(size_mb * 1024 * 1024), random.Random(seed))
+    return path
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="insighthub-text-")
+    os.makedirs(work_dir, exist_ok=True)
+
+    from app.processing.parser import iter_pages
+    from app.processing.chunker import iter_chunks
+
+    gen_started = time.perf_counter()
+    path = _make_file(work_dir, args.kind, args.size_mb, args.seed)
+    generate_seconds = time.perf_counter() - gen_started
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+
+    rss_before = peak_rss_mb()
+    pages = 0
+    chunks = 0
+    last_page = None
+    started = time.perf_counter()
+    for chunk in iter_chunks(iter_pages(path)):
+        chunks += 1
+        if chunk["page"] != last_page:
+            pages += 1
+            last_page = chunk["page"]
+    parse_seconds = time.perf_counter() - started
+    rss_after = peak_rss_mb()
+
+    results: Dict[str, Any] = {
+        "params": {
+            "kind": args.kind,
+            "size_mb": args.size_mb,
+            "ingest_mb": args.ingest_mb,
+            "seed": args.seed,
+        },
+        "generate_seconds": round(generate_seconds, 3),
+        "parse_chunk": {
+            "file_mb": round(size_mb, 2),
+            "seconds": round(parse_seconds, 3),
+            "mb_per_sec": round(size_mb / parse_seconds, 2) if parse_seconds else 0.0,
+            "pages": pages,
+            "chunks": chunks,
+            "chunks_per_sec": round(chunks / parse_seconds, 1) if parse_seconds else 0.0,
+            "peak_rss_mb_before": rss_before,
+            "peak_rss_mb_after": rss_after,
+        },
+    }
+    if not args.keep_files:
+        os.remove(path)
+
+    if args.ingest_mb > 0:
+        install_fake_firebase()
+        from app.vector_store import faiss_index, lexical_index
+        from app.processing.pipeline import process_document
+        from app.services import storage
+        from app.services.sqlite_store import SQLiteStore
+
+        store = SQLiteStore(os.path.join(work_dir, "metadata.db"))
+        storage.set_store(store)
+        index_dir = os.path.join(work_dir, "vector_store")
+        os.makedirs(index_dir, exist_ok=True)
+        faiss_index.INDEX_PATH = os.path.join(index_dir, "faiss.index")
+        faiss_index.META_PATH = os.path.join(index_dir, "faiss_meta.json")
+        faiss_index.index.reset()
+        faiss_index.metadata_store.clear()
+        faiss_index.embedding_store.clear()
+        lexical_index.rebuild([])
+
+        ingest_path = _make_file(work_dir, args.kind, args.ingest_mb, args.seed + 1)
+        doc_id = os.path.basename(ingest_path)
+        started = time.perf_counter()
+        process_document(doc_id, ingest_path)
+        ingest_seconds = time.perf_counter() - started
+        record = store.get_document(doc_id) or {}
+        results["process_document"] = {
+            "file_mb": round(os.path.getsize(ingest_path) / (1024 * 1024), 2),
+            "seconds": round(ingest_seconds, 3),
+            "mb_per_sec": round(args.ingest_mb / ingest_seconds, 3) if ingest_seconds else 0.0,
+            "pages": record.get("page_count"),
+            "chunks": record.get("chunk_count"),
+            "stages": record.get("ingest_timings"),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        if not args.keep_files:
+            os.remove(ingest_path)
+
+    return results
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Streaming TXT/MD ingestion benchmark")
+    parser.add_argument("--kind", choices=["markdown", "log"], default="markdown")
+    parser.add_argument("--size-mb", type=float, default=1024,
+                        help="Size of the file streamed through parse + chunk")
+    parser.add_argument("--ingest-mb", type=float, default=5,
+                        help="Size of the file run through process_document (0 skips)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-files", action="store_true")
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    payload = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    print(payload)
+
+if __name__ == "__main__":
+    main()
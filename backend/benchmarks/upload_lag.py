@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.run import latency_summary
+
+# ----------------------------
+# Event-loop lag during concurrent uploads
+# ----------------------------
+# A probe coroutine sleeps for a fixed interval and records how late it wakes
+# up; any blocking work on the loop (disk copies, hashing) shows up as lag.
+# Uploads go through the real FastAPI router in-process via httpx's ASGI
+# transport, with metadata going to a temporary SQLite store.
+
+PROBE_INTERVAL = 0.005
+
+async def _probe(stop: asyncio.Event, lags: List[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+def _build_app(upload_dir: str):
+    from fastapi import FastAPI, File, UploadFile
+    from app.api import documents
+    from app.auth.verify_token import verify_firebase_token
+    from app.services import storage, uploads
+    from app.services.sqlite_store import SQLiteStore
+
+    storage.set_store(SQLiteStore(os.path.join(upload_dir, "metadata.db")))
+    uploads.UPLOAD_DIR = documents.UPLOAD_DIR = upload_dir
+    uploads.PARTIAL_DIR = os.path.join(upload_dir, ".partial")
+    os.makedirs(uploads.PARTIAL_DIR, exist_ok=True)
+    # Only the upload path is under test here
+    documents._process_document_task = lambda filename, file_path: None
+
+    app = FastAPI()
+    app.include_router(documents.router)
+    app.dependency_overrides[verify_firebase_token] = lambda: "bench-user"
+
+    # The pre-streaming implementation, kept for comparison
+    @app.post("/baseline/upload")
+    async def baseline_upload(file: UploadFile = File(...)):
+        file_path = os.path.join(upload_dir, f"baseline-{time.perf_counter_ns()}")
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        return {"size_bytes": os.path.getsize(file_path)}
+
+    return app
+
+async def _multipart_upload(client, path: str, payload_path: str) -> None:
+    with open(payload_path, "rb") as f:
+        response = await client.post(path, files={"file": ("bench.txt", f, "text/plain")})
+    response.raise_for_status()
+
+async def _resumable_upload(client, payload_path: str, chunk_bytes: int) -> None:
+    size = os.path.getsize(payload_path)
+    response = await client.post(
+        "/documents/uploads", json={"filename": "bench.txt", "size_bytes": size}
+    )
+    response.raise_for_status()
+    upload_id = response.json()["upload_id"]
+    offset = 0
+    with open(payload_path, "rb") as f:
+        while offset < size:
+            chunk = f.read(chunk_bytes)
+            response = await client.put(
+                f"/documents/uploads/{upload_id}", params={"offset": offset}, content=chunk
+            )
+            response.raise_for_status()
+            offset = response.json()["received_bytes"]
+    response = await client.post(f"/documents/uploads/{upload_id}/complete")
+    response.raise_for_status()
+
+async def _run_mode(app, mode: str, payload_path: str, args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        lags: List[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(stop, lags))
+        started = time.perf_counter()
+        if mode == "resumable":
+            jobs = [
+                _resumable_upload(client, payload_path, args.chunk_mb * 1024 * 1024)
+                for _ in range(args.concurrency)
+            ]
+        else:
+            path = "/baseline/upload" if mode == "baseline" else "/documents/upload"
+            jobs = [_multipart_upload(client, path, payload_path) for _ in range(args.concurrency)]
+        await asyncio.gather(*jobs)
+        wall = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    total_mb = args.size_mb * args.concurrency
+    return {
+        "wall_seconds": round(wall, 3),
+        "mb_per_sec": round(total_mb / wall, 2) if wall else 0.0,
+        "loop_lag": {
+            **latency_summary(lags),
+            "max_ms": round(max(lags) * 1000.0, 3) if lags else 0.0,
+        },
+    }
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix="insighthub-upload-")
+    payload_path = os.path.join(work_dir, "payload.txt")
+    with open(payload_path, "wb") as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            f.write(block)
+
+    app = _build_app(os.path.join(work_dir, "uploads"))
+    results: Dict[str, Any] = {
+        "params": {
+            "size_mb": args.size_mb,
+            "concurrency": args.concurrency,
+            "chunk_mb": args.chunk_mb,
+        },
+    }
+    for mode in args.modes:
+        results[mode] = asyncio.run(_run_mode(app, mode, payload_path, args))
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Event-loop lag during concurrent uploads")
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk-mb", type=int, default=8, help="Resumable upload part size")
+    parser.add_argument("--modes", nargs="+", default=["baseline", "streaming", "resumable"],
+                        choices=["baseline", "streaming", "resumable"])
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from app.ai.context import build_context
+from app.utils.text_utils import estimate_tokens
+
+# OCR text and log exports have no sentence boundaries, so the whole chunk
+# would otherwise be a single unit bigger than any sensible budget
+UNPUNCTUATED = " ".join(f"entry{i} worker status ok" for i in range(150))
+
+def _chunk(text: str) -> dict:
+    return {"doc_id": "export.log", "page": 1, "text": text}
+
+def test_unpunctuated_chunk_fits_budget():
+    context, evidence = build_context("worker status", [_chunk(UNPUNCTUATED)], 400)
+    assert context
+    assert estimate_tokens(context) <= 400
+    assert [e["documentName"] for e in evidence] == ["export.log"]
+
+def test_unmatched_unpunctuated_chunk_is_trimmed():
+    context, _ = build_context("quarterly revenue", [_chunk(UNPUNCTUATED)], 50)
+    assert context
+    assert estimate_tokens(context) <= 50
+    assert UNPUNCTUATED.startswith(context.split()[0])
+
+def test_oversized_sentence_is_trimmed_to_remaining_budget():
+    sentence = "The worker status was ok. " + " ".join(["worker status ok"] * 200) + "."
+    context, _ = build_context("worker status", [_chunk(sentence)], 30)
+    assert context
+    assert estimate_tokens(context) <= 30
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+
+from app.ai.embeddings import load_model
+
+# Same model weights, so the fp32 export should match torch almost exactly;
+# int8 quantization is allowed a little more drift
+MIN_COSINE = {
+    "onnx": 0.99,
+    "onnx-int8": 0.98,
+}
+
+TEXTS = [
+    "Revenue",
+    "What was the operating margin in 2021?",
+    '"412.5 million"',
+    "Acme Holdings reported net income of 87.3 million in 2019.",
+    "Year; Revenue; Gross Margin; Headcount | 2020; 1204; 38.2%; 5400 | 2021; 1388; 40.1%; 5920",
+    "The company faces risks from currency fluctuations, supplier concentration "
+    "and pending litigation, any of which could materially affect results.",
+    "Invoice INV-2023-0042 was issued on 2023-03-14 for 12,500.00 EUR.",
+    "## Outlook\n\nManagement expects demand to recover in the second half, "
+    "driven by new product launches and improved channel inventory.",
+    " ".join(["Cash flow from operations increased while capital expenditure was flat."] * 40),
+]
+
+@pytest.fixture(scope="module")
+def torch_embeddings():
+    return load_model("torch").encode(TEXTS)
+
+def _cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+@pytest.mark.parametrize("backend", sorted(MIN_COSINE))
+def test_backend_matches_torch(backend, torch_embeddings):
+    embeddings = load_model(backend).encode(TEXTS)
+    assert embeddings.shape == torch_embeddings.shape
+    cosines = _cosines(np.asarray(embeddings), np.asarray(torch_embeddings))
+    worst = int(cosines.argmin())
+    assert cosines[worst] >= MIN_COSINE[backend], (
+        f"{backend} cosine {cosines[worst]:.4f} vs torch on {TEXTS[worst][:60]!r}"
+    )